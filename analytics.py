@@ -0,0 +1,146 @@
+import argparse
+import hmac
+import json
+import os
+from contextlib import closing
+
+import responses
+
+# =========================
+# 실시간 집계 (관리자 화면용)
+# - 제출 행(sheet1)이 워크시트에 저장된 것으로 기록하는 같은 트랜잭션에서 누적 합계를 갱신 (outbox.mark_sent)
+#   → 시트에 저장된 응답과 집계가 항상 일치 (전송 대기·재시도 중인 응답은 저장된 뒤 반영)
+# - 집계 표 agg: (dim, code) 마다 응답 수와 점수 합·제곱합
+#   dim = "all"(전체 1행) / 유형 코드 / 인구학 컬럼, code = 저장된 코드 값
+#   → 행 수는 코드표 크기로 고정 → 응답이 몇 천 건이어도 조회 비용 일정
+# - 관리자 화면: app.py?admin=<SURVEY_ADMIN_TOKEN>
+# =========================
+ADMIN_TOKEN = os.environ.get("SURVEY_ADMIN_TOKEN", "")
+
+SCORE_COLUMNS = ["total", "감", "수", "성", "정신"]
+SCORE_FIELDS = ["total", "gam", "su", "seong", "mental"]  # SQL 컬럼 이름
+DIMS = ["전체유형코드", "정신질환유형코드"] + responses.DEMO_COLUMNS
+ALL = "all"
+BASIS = "sent"  # agg_meta 'basis': 집계 기준 (이전 버전은 outbox 커밋 시점 기준 → 열 때 다시 계산)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agg (
+    dim TEXT NOT NULL,
+    code INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    {sums},
+    PRIMARY KEY (dim, code)
+);
+CREATE TABLE IF NOT EXISTS agg_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+""".format(sums=",\n    ".join(
+    f"sum_{f} REAL NOT NULL DEFAULT 0, sq_{f} REAL NOT NULL DEFAULT 0" for f in SCORE_FIELDS
+))
+
+_UPSERT = (
+    "INSERT INTO agg (dim, code, n, {cols}) VALUES (?, ?, 1, {marks}) "
+    "ON CONFLICT (dim, code) DO UPDATE SET n = n + 1, {updates}"
+).format(
+    cols=", ".join(f"sum_{f}, sq_{f}" for f in SCORE_FIELDS),
+    marks=", ".join("?, ?" for _ in SCORE_FIELDS),
+    updates=", ".join(f"sum_{f} = sum_{f} + excluded.sum_{f}, sq_{f} = sq_{f} + excluded.sq_{f}"
+                      for f in SCORE_FIELDS),
+)
+
+
+def init(conn):
+    # outbox.connect 가 DB 파일마다 한 번 호출 (트랜잭션 밖)
+    conn.executescript(SCHEMA)
+    row = conn.execute("SELECT value FROM agg_meta WHERE key = 'basis'").fetchone()
+    if row is None or row[0] != BASIS:
+        rebuild(conn)
+
+
+def _params(values: list) -> list:
+    row = responses.from_values(values)
+    if row["total"] is None:
+        return []
+    scores = []
+    for col in SCORE_COLUMNS:
+        v = row[col] or 0
+        scores += [v, v * v]
+    keys = [(ALL, 0)] + [(dim, row[dim]) for dim in DIMS if row[dim] is not None]
+    return [(dim, code, *scores) for dim, code in keys]
+
+
+def apply(conn, items: list):
+    # outbox.mark_sent 의 트랜잭션 안에서 호출: items = 이번에 저장된 [(worksheet, 행 값 리스트), ...]
+    params = []
+    for ws, values in items:
+        if ws == "sheet1":
+            params.extend(_params(values))
+    if params:
+        conn.executemany(_UPSERT, params)
+
+
+def rebuild(conn):
+    # 집계를 워크시트에 저장된 sheet1 행 전체로 다시 계산 (처음 만들 때 / 복구용)
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("DELETE FROM agg")
+    payloads = conn.execute(
+        "SELECT payload FROM outbox WHERE worksheet = 'sheet1' AND sent_at IS NOT NULL ORDER BY id"
+    ).fetchall()
+    for (payload,) in payloads:
+        conn.executemany(_UPSERT, _params(json.loads(payload)))
+    conn.execute("INSERT OR REPLACE INTO agg_meta (key, value) VALUES ('built', datetime('now'))")
+    conn.execute("INSERT OR REPLACE INTO agg_meta (key, value) VALUES ('basis', ?)", (BASIS,))
+    conn.execute("COMMIT")
+
+
+def snapshot(path: str = None) -> dict:
+    # -> {"n": 전체 응답 수, "scores": {컬럼: {"mean", "sd"}}, "dims": {dim: [{"code", "n", "mean_total"}]}}
+    import outbox
+    with closing(outbox.connect(path)) as conn:
+        rows = conn.execute(
+            "SELECT dim, code, n, {} FROM agg ORDER BY dim, code".format(
+                ", ".join(f"sum_{f}, sq_{f}" for f in SCORE_FIELDS))
+        ).fetchall()
+
+    out = {"n": 0, "scores": {}, "dims": {dim: [] for dim in DIMS}}
+    for dim, code, n, *sums in rows:
+        if dim == ALL:
+            out["n"] = n
+            for k, col in enumerate(SCORE_COLUMNS):
+                s, sq = sums[2 * k], sums[2 * k + 1]
+                mean = s / n
+                var = (sq - s * s / n) / (n - 1) if n > 1 else 0.0
+                out["scores"][col] = {"mean": round(mean, 2), "sd": round(max(var, 0.0) ** 0.5, 2)}
+        elif dim in out["dims"]:
+            out["dims"][dim].append({"code": code, "n": n, "mean_total": round(sums[0] / n, 2)})
+    return out
+
+
+def is_admin(query_params) -> bool:
+    # 토큰 비교는 일정 시간 비교 (응답 시간으로 토큰을 한 글자씩 추측하지 못하게)
+    given = query_params.get("admin") or ""
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(given.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+# =========================
+# CLI: python analytics.py {show,rebuild}
+# =========================
+def main(argv=None):
+    import outbox
+
+    parser = argparse.ArgumentParser(description="관리자 화면용 누적 집계 확인/재계산")
+    parser.add_argument("--path", default=outbox.OUTBOX_PATH, help="outbox SQLite 파일 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("show", help="현재 집계 출력")
+    sub.add_parser("rebuild", help="outbox 의 sheet1 행 전체로 집계 다시 계산")
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        with closing(outbox.connect(args.path)) as conn:
+            rebuild(conn)
+    print(json.dumps(snapshot(args.path), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
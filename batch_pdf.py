@@ -0,0 +1,106 @@
+import argparse
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import responses
+
+# =========================
+# 결과지 PDF 일괄 생성 (오프라인 재발급용)
+# 예) python batch_pdf.py responses.csv --out results.zip --workers 8
+#     python batch_pdf.py outbox --out pdf_dir/
+# - 저장된 행에서 result dict 재구성 → 작업 프로세스들이 make_result_pdf 실행
+# - 완성되는 순서대로 zip(또는 디렉터리)에 바로 기록, 진행률과 초당 PDF 수 출력
+# =========================
+def _render(task):
+    import result_pdf
+    name, result = task
+    return name, result_pdf.make_result_pdf(result)
+
+
+def _init_worker():
+    import result_pdf
+    result_pdf.warm_up()  # 첫 작업 전에 폰트 등록/예열을 끝내 둠
+
+
+def process_pool(workers: int = None) -> ProcessPoolExecutor:
+    # PDF 생성은 CPU 작업이라 스레드가 아닌 프로세스로 분산 (cohort_reports.py 도 같은 풀을 씀)
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+
+def _file_name(n: int, result: dict) -> str:
+    stamp = re.sub(r"[^0-9]", "", str(result.get("time_str") or ""))
+    return f"{n:06d}_{stamp}.pdf" if stamp else f"{n:06d}.pdf"
+
+
+class _Sink:
+    def __init__(self, out: str):
+        self.zip = None
+        self.dir = None
+        if out.lower().endswith(".zip"):
+            self.zip = zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED)
+        else:
+            os.makedirs(out, exist_ok=True)
+            self.dir = out
+
+    def write(self, name: str, data: bytes):
+        if self.zip is not None:
+            self.zip.writestr(name, data)
+        else:
+            with open(os.path.join(self.dir, name), "wb") as f:
+                f.write(data)
+
+    def close(self):
+        if self.zip is not None:
+            self.zip.close()
+
+
+def _progress(done: int, total: int, started: float, final: bool = False):
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    end = "\n" if final else "\r"
+    print(f"{done}/{total} PDFs  {done / elapsed:.1f} PDF/s  {elapsed:.1f}s", end=end, file=sys.stderr)
+
+
+def run(source: str, out: str, workers: int = None, chunksize: int = 8,
+        start: int = 0, limit: int = None) -> int:
+    rows = responses.complete_rows(responses.load(source))
+    rows = rows[start:start + limit if limit else None]
+    results = responses.to_results(rows)
+    tasks = [(_file_name(start + n + 1, r), r) for n, r in enumerate(results)]
+
+    sink = _Sink(out)
+    started = time.perf_counter()
+    last_report = 0.0
+    done = 0
+    try:
+        with process_pool(workers) as pool:
+            for name, data in pool.map(_render, tasks, chunksize=chunksize):
+                sink.write(name, data)
+                done += 1
+                now = time.perf_counter()
+                if now - last_report >= 1.0:
+                    _progress(done, len(tasks), started)
+                    last_report = now
+    finally:
+        sink.close()
+    _progress(done, len(tasks), started, final=True)
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="감·수·성 결과지 PDF 일괄 생성")
+    parser.add_argument("source", help='응답 출처: CSV 경로 | "outbox" | "outbox:<경로>" | "sheet" | "cache" | "cache:<경로>"')
+    parser.add_argument("--out", required=True, help="출력 .zip 파일 또는 디렉터리")
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--chunksize", type=int, default=8)
+    parser.add_argument("--start", type=int, default=0, help="건너뛸 앞쪽 행 수")
+    parser.add_argument("--limit", type=int, default=None, help="생성할 최대 건수")
+    args = parser.parse_args(argv)
+    run(args.source, args.out, args.workers, args.chunksize, args.start, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+from collections import namedtuple
+from io import BytesIO
+
+import numpy as np
+from reportlab.pdfgen import canvas
+
+import perception_schema
+import result_pdf
+import scoring
+
+# =========================
+# 마이크로 벤치마크 (채점·분류 / 레이더 / 결과지 PDF / perception 응답 레코드)
+# 예) python bench.py run --quick
+#     python bench.py save --note "..."    → bench_baseline.json 갱신 (기준 머신에서, 측정 환경 메모 포함)
+#     python bench.py compare --threshold 0.2
+# - 입력은 고정 시드로 생성 → 실행마다 같은 데이터
+# - 건별(1명) 경로와 1k/100k 명 배치 경로를 따로 측정
+# - 측정값: 초당 처리 건수(ops/s), 호출 1회 동안의 최대 할당량(tracemalloc peak),
+#   결과가 바이트(PDF)인 항목은 출력 크기(out_kb)도 기록
+# =========================
+SEED = 20240601
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+ALLOC_NOISE_KB = 16.0  # 할당량 비교에서 무시할 절대 차이
+
+Case = namedtuple("Case", ["name", "fn", "n", "large"])  # n: 호출 1회당 처리 건수
+
+
+def _answers(n: int) -> np.ndarray:
+    rng = np.random.default_rng(SEED)
+    return rng.integers(1, 5, size=(n, scoring.N_ITEMS), dtype=np.int8)
+
+
+def _record_values(n: int) -> list:
+    # perception 위젯 값(정수 코드) 묶음 n 세션분
+    rng = np.random.default_rng(SEED)
+    codes = rng.integers(1, 4, size=(n, len(perception_schema.ITEM_COLUMNS)))
+    return [dict(zip(perception_schema.ITEM_COLUMNS, row.tolist())) for row in codes]
+
+
+def _labels(options: list, n: int) -> list:
+    rng = np.random.default_rng(SEED)
+    return [options[i] for i in rng.integers(0, len(options), size=n)]
+
+
+def _records(values_list: list) -> list:
+    # 세션 레코드(int8 슬롯)만 만들어 보관 → retained_kb / n = 세션 1개의 응답 상태 크기
+    out = []
+    for values in values_list:
+        record = perception_schema.AnswerRecord()
+        record.update(values)
+        out.append(record)
+    return out
+
+
+def _fill_records(values_list: list) -> list:
+    # 세션 레코드에 응답 반영 → 제출 시처럼 척도 문항 값 전부 읽기
+    out = []
+    for values in values_list:
+        record = perception_schema.AnswerRecord()
+        record.update(values)
+        out.append(record.item_values())
+    return out
+
+
+def _draw_radar(r: dict, grid: bool):
+    # 레이더를 빈 캔버스에 그림 (grid=False: 결과지마다 새로 그리는 응답자별 계열만)
+    c = canvas.Canvas(BytesIO())
+    args = (result_pdf.CHART_X, result_pdf.CHART_Y, result_pdf.CHART_SIZE,
+            (r["감"], r["수"], r["성"]), (r["mh_gam"], r["mh_su"], r["mh_seong"]))
+    if grid:
+        result_pdf.draw_radar(c, *args)
+    else:
+        result_pdf.draw_radar_series(c, *args)
+    return c
+
+
+def build_cases() -> list:
+    one = [int(x) for x in _answers(1)[0]]
+    a1k = _answers(1_000)
+    a100k = _answers(100_000)
+    r = scoring.score_one(one)
+
+    def classify_scalar(answers):
+        # score_batch 와 같은 응답 수로 건별 분류 → 두 경로를 같은 크기에서 비교
+        b = scoring.score_batch(answers)
+        scores = list(zip(*(b[k].tolist() for k in scoring.SCORE_KEYS)))
+
+        def fn():
+            for total, gam, su, seong, mh, mh_gam, mh_su, mh_seong in scores:
+                scoring.classify_main_type(total, gam, su, seong)
+                scoring.classify_mental_type(mh, mh_gam, mh_su, mh_seong)
+        return fn
+
+    cases = [
+        Case("classify_4type_by_scores",
+             lambda: scoring.classify_4type_by_scores(r["감"], r["수"], r["성"], 19, 3), 1, False),
+        Case("classify_scalar/1k", classify_scalar(a1k), 1_000, False),
+        Case("classify_scalar/100k", classify_scalar(a100k), 100_000, True),
+        Case("score_one", lambda: scoring.score_one(one), 1, False),
+        Case("score_batch/1k", lambda: scoring.score_batch(a1k), 1_000, False),
+        Case("score_batch/100k", lambda: scoring.score_batch(a100k), 100_000, True),
+        Case("radar/vector_series", lambda: _draw_radar(r, grid=False), 1, False),
+        Case("radar/vector_full", lambda: _draw_radar(r, grid=True), 1, False),
+        Case("make_result_pdf", lambda: result_pdf.make_result_pdf(r), 1, False),
+    ]
+
+    # answer_record: 레코드 채우기 + 제출 시 item_values() dict 생성까지 (retained 는 dict 가 대부분)
+    # answer_record_slots: int8 슬롯 레코드만 (세션에 실제로 남는 상태)
+    for n, label, large in [(1_000, "1k", False), (10_000, "10k", True)]:
+        values = _record_values(n)
+        cases.append(Case(f"answer_record/{label}", lambda values=values: _fill_records(values), n, large))
+        cases.append(Case(f"answer_record_slots/{label}", lambda values=values: _records(values), n, large))
+
+    # 이전 방식: 표시 문자열 위젯 값 → 제출 시 숫자로 파싱
+    converters = [
+        ("likert5_to_num", perception_schema.likert5_to_num, perception_schema.LIKERT5),
+        ("sdiff7_to_num", perception_schema.sdiff7_to_num, perception_schema.SDIFF_7),
+        ("freq3_to_num", perception_schema.freq3_to_num, perception_schema.FREQ3),
+        ("yesno3_to_num", perception_schema.yesno3_to_num, perception_schema.YESNO3),
+    ]
+    for name, fn, options in converters:
+        for n, label, large in [(1_000, "1k", False), (100_000, "100k", True)]:
+            values = _labels(options, n)
+            cases.append(Case(f"{name}/{label}", lambda fn=fn, values=values: [fn(v) for v in values], n, large))
+    return cases
+
+
+# =========================
+# 측정
+# =========================
+def measure(case: Case, repeat: int = 5) -> dict:
+    case.fn()  # 예열 (폰트 등록, lru_cache 채우기 등)
+    timer = timeit.Timer(case.fn)
+    number, _ = timer.autorange()  # 1회 측정이 0.2초 이상 되도록 반복 횟수 결정
+    sec = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    out = case.fn()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "n": case.n,
+        "sec_per_call": round(sec, 9),
+        "ops_per_sec": round(case.n / sec, 1),
+        "peak_kb": round((peak - before) / 1024, 1),
+        "retained_kb": round((after - before) / 1024, 1),
+    }
+    if isinstance(out, bytes):
+        result["out_kb"] = round(len(out) / 1024, 1)
+    return result
+
+
+def _cpu_model() -> str:
+    # platform.processor() 는 리눅스에서 "x86_64" 정도만 돌려줌 → /proc/cpuinfo 의 모델명
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def machine() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": _cpu_model(),
+        "cpus": os.cpu_count(),
+        # 컨테이너/taskset 으로 제한된 경우 cpus 보다 작음
+        "cpus_usable": len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count(),
+        "numpy": np.__version__,
+    }
+
+
+def run(only: str = None, quick: bool = False, repeat: int = 5) -> dict:
+    results = {}
+    for case in build_cases():
+        if quick and case.large:
+            continue
+        if only and only not in case.name:
+            continue
+        results[case.name] = measure(case, repeat)
+        print(f"  {_line(case.name, results[case.name])}", file=sys.stderr)
+    return {"seed": SEED, "machine": machine(), "cases": results}
+
+
+def _line(name: str, c: dict) -> str:
+    line = f"{name:<28}{c['ops_per_sec']:>14,.1f} ops/s{c['peak_kb']:>12,.1f} KB peak"
+    if "out_kb" in c:
+        line += f"{c['out_kb']:>10,.1f} KB out"
+    return line
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    # 기준보다 threshold(비율) 넘게 느려지거나 할당이 늘어난 항목 목록
+    flagged = []
+    print(f"{'case':<28}{'base ops/s':>14}{'now ops/s':>14}{'change':>9}{'peak KB':>10}")
+    for name, cur in current["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            print(f"{name:<28}{'-':>14}{cur['ops_per_sec']:>14,.1f}{'new':>9}{cur['peak_kb']:>10,.1f}")
+            continue
+        slowdown = base["ops_per_sec"] / cur["ops_per_sec"] - 1
+        alloc_growth = cur["peak_kb"] - base["peak_kb"]
+        marks = []
+        if slowdown > threshold:
+            marks.append("SLOWER")
+        if alloc_growth > ALLOC_NOISE_KB and cur["peak_kb"] > base["peak_kb"] * (1 + threshold):
+            marks.append("MORE ALLOC")
+        if "out_kb" in base and cur.get("out_kb", 0) > base["out_kb"] * (1 + threshold):
+            marks.append("BIGGER")
+        if marks:
+            flagged.append((name, marks))
+        print(f"{name:<28}{base['ops_per_sec']:>14,.1f}{cur['ops_per_sec']:>14,.1f}"
+              f"{-slowdown:>+9.0%}{cur['peak_kb']:>10,.1f}  {' '.join(marks)}")
+    base_machine = baseline.get("machine") or {}
+    diff = [k for k in current["machine"] if base_machine.get(k) != current["machine"][k]]
+    if diff:
+        print("※ 기준값과 측정 환경이 다릅니다: "
+              + ", ".join(f"{k} {base_machine.get(k)} → {current['machine'][k]}" for k in diff))
+    if baseline.get("note"):
+        print(f"※ 기준값 메모: {baseline['note']}")
+    return flagged
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--baseline", default=BASELINE_PATH)
+    common.add_argument("--only", default=None, help="이름에 이 문자열이 들어간 항목만")
+    common.add_argument("--quick", action="store_true", help="100k 배치 항목 생략")
+    common.add_argument("--repeat", type=int, default=5)
+
+    parser = argparse.ArgumentParser(description="채점/레이더/PDF/응답 레코드 마이크로 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("run", parents=[common], help="측정 후 결과 출력")
+    p.add_argument("--json", default=None, help="결과를 JSON 파일로 저장")
+    p = sub.add_parser("save", parents=[common], help="측정 결과를 기준값 파일로 저장")
+    p.add_argument("--note", default=None, help="기준값과 함께 남길 측정 환경 메모 (예: 1 CPU 컨테이너)")
+    p = sub.add_parser("compare", parents=[common], help="기준값과 비교, 느려진 항목이 있으면 종료 코드 1")
+    p.add_argument("--threshold", type=float, default=0.25, help="허용 비율 (0.25 = 25%%)")
+
+    args = parser.parse_args(argv)
+    current = run(args.only, args.quick, args.repeat)
+
+    if args.command == "run":
+        for name, c in current["cases"].items():
+            print(_line(name, c))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(current, f, ensure_ascii=False, indent=2)
+    elif args.command == "save":
+        if args.note:
+            current["note"] = args.note
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"saved {len(current['cases'])} cases to {args.baseline}")
+    elif args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        flagged = compare(current, baseline, args.threshold)
+        if flagged:
+            print(f"{len(flagged)} case(s) beyond {args.threshold:.0%}: "
+                  + ", ".join(name for name, _ in flagged))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
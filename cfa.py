@@ -0,0 +1,312 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import reliability
+import responses
+
+# =========================
+# 감·수·성 3요인 확인적 요인분석 (CFA, NumPy 최대우도)
+# 예) python cfa.py responses.csv
+#     python cfa.py cache --boot 2000 --workers 16 --json cfa.json
+# - 모형: 문항 q1~9 → 감, q10~18 → 수, q19~27 → 성 (채점 방식과 같은 구조), 요인 분산 1 로 고정
+#   Σ = Λ Φ Λᵀ + Θ  (Λ: 27x3 적재값, Φ: 요인 상관, Θ: 고유분산 대각)
+# - ML 적합함수 F = log|Σ| + tr(SΣ⁻¹) − log|S| − p 를 해석적 기울기 + BFGS 로 최소화 (scipy 불필요)
+# - 적합도: χ², df, CFI, RMSEA, SRMR / 표준화 적재값, 요인 상관
+# - 부트스트랩: 재표집마다 SeedSequence 자식 시드를 따로 씀 → 작업 프로세스 수와 무관하게 같은 결과
+# =========================
+FACTORS = ["감", "수", "성"]
+ITEMS = [i for f in FACTORS for i in reliability.SUBSCALES[f]]  # 0-based 문항 번호 (q1~q27 순서)
+P = len(ITEMS)
+K = len(FACTORS)
+ITEM_FACTOR = np.array([k for k, f in enumerate(FACTORS) for _ in reliability.SUBSCALES[f]])
+PHI_PAIRS = [(a, b) for a in range(K) for b in range(a + 1, K)]
+N_PARAMS = P + len(PHI_PAIRS) + P  # 적재값, 요인 상관, 고유분산(log)
+DF = P * (P + 1) // 2 - N_PARAMS
+
+SEED = 20240601
+MAX_ITER = 500
+GTOL = 1e-6
+
+
+# =========================
+# 모형 (파라미터 벡터 ↔ Σ)
+# =========================
+def _unpack(x: np.ndarray) -> tuple:
+    lam = np.zeros((P, K))
+    lam[np.arange(P), ITEM_FACTOR] = x[:P]
+    phi = np.eye(K)
+    for (a, b), z in zip(PHI_PAIRS, x[P:P + len(PHI_PAIRS)]):
+        phi[a, b] = phi[b, a] = np.tanh(z)  # 상관을 (-1, 1) 안에 두기 위한 변환
+    theta = np.exp(x[P + len(PHI_PAIRS):])   # 고유분산 > 0
+    return lam, phi, theta
+
+
+def implied_cov(x: np.ndarray) -> np.ndarray:
+    lam, phi, theta = _unpack(x)
+    return lam @ phi @ lam.T + np.diag(theta)
+
+
+def _objective(x: np.ndarray, s: np.ndarray, logdet_s: float) -> tuple:
+    # -> (F_ML, 기울기). Σ 가 양의 정부호가 아니면 (inf, None)
+    lam, phi, theta = _unpack(x)
+    sigma = lam @ phi @ lam.T + np.diag(theta)
+    try:
+        chol = np.linalg.cholesky(sigma)
+    except np.linalg.LinAlgError:
+        return np.inf, None
+    inv = np.linalg.inv(sigma)
+    inv_s = inv @ s
+    f = 2 * np.log(np.diag(chol)).sum() + np.trace(inv_s) - logdet_s - P
+
+    g_sigma = inv - inv_s @ inv  # dF/dΣ
+    grad = np.empty_like(x)
+    grad[:P] = 2 * (g_sigma @ lam @ phi)[np.arange(P), ITEM_FACTOR]
+    g_phi = lam.T @ g_sigma @ lam
+    for j, (a, b) in enumerate(PHI_PAIRS):
+        grad[P + j] = 2 * g_phi[a, b] * (1 - phi[a, b] ** 2)
+    grad[P + len(PHI_PAIRS):] = np.diag(g_sigma) * theta
+    return f, grad
+
+
+def start_values(s: np.ndarray) -> np.ndarray:
+    # 같은 요인 문항 간 평균 상관으로 적재값 초기값, 나머지 분산을 고유분산으로
+    sd = np.sqrt(np.diag(s))
+    corr = s / np.outer(sd, sd)
+    lam = np.empty(P)
+    for k in range(K):
+        idx = np.flatnonzero(ITEM_FACTOR == k)
+        block = corr[np.ix_(idx, idx)]
+        mean_r = (block.sum(axis=1) - 1) / (len(idx) - 1)
+        lam[idx] = np.sqrt(np.clip(mean_r, 0.05, 0.95)) * sd[idx]
+    theta = np.maximum(np.diag(s) - lam ** 2, 0.05 * np.diag(s))
+    return np.concatenate([lam, np.full(len(PHI_PAIRS), np.arctanh(0.3)), np.log(theta)])
+
+
+def _align_signs(x: np.ndarray) -> np.ndarray:
+    # 요인 부호는 식별되지 않음 (적재값·상관을 함께 뒤집어도 Σ 동일)
+    # → 적재값 합이 양수가 되도록 맞춤 (부트스트랩 재표집 간 비교 가능하게)
+    x = x.copy()
+    for k in range(K):
+        on_k = ITEM_FACTOR == k
+        if x[:P][on_k].sum() < 0:
+            x[:P][on_k] *= -1
+            for j, pair in enumerate(PHI_PAIRS):
+                if k in pair:
+                    x[P + j] *= -1
+    return x
+
+
+def _bfgs(fun, x0: np.ndarray, max_iter: int = MAX_ITER, gtol: float = GTOL) -> tuple:
+    # -> (x, f, 수렴 여부, 반복 수). 역헤시안 BFGS 갱신 + Armijo 역추적 선탐색
+    x = x0.copy()
+    f, g = fun(x)
+    if g is None:
+        return x, f, False, 0
+    eye = np.eye(len(x))
+    h = eye.copy()
+    for it in range(max_iter):
+        if np.abs(g).max() < gtol:
+            return x, f, True, it
+        d = -h @ g
+        slope = g @ d
+        if slope >= 0:  # 하강 방향이 아니면 경사 하강으로 되돌림
+            h, d = eye.copy(), -g
+            slope = g @ d
+        step = 1.0
+        while True:
+            x_new = x + step * d
+            f_new, g_new = fun(x_new)
+            if g_new is not None and f_new <= f + 1e-4 * step * slope:
+                break
+            step *= 0.5
+            if step < 1e-12:
+                return x, f, False, it
+        s_vec, y_vec = x_new - x, g_new - g
+        sy = s_vec @ y_vec
+        if sy > 1e-12:
+            if it == 0:
+                h = eye * (sy / (y_vec @ y_vec))
+            rho = 1.0 / sy
+            v = eye - rho * np.outer(s_vec, y_vec)
+            h = v @ h @ v.T + rho * np.outer(s_vec, s_vec)
+        x, f, g = x_new, f_new, g_new
+    return x, f, bool(np.abs(g).max() < gtol), max_iter
+
+
+# =========================
+# 적합
+# =========================
+def sample_cov(answers: np.ndarray) -> np.ndarray:
+    x = np.asarray(answers, dtype=np.float64)[:, ITEMS]
+    return np.cov(x, rowvar=False)
+
+
+def fit_cov(s: np.ndarray, n: int, x0: np.ndarray = None) -> dict:
+    sign, logdet_s = np.linalg.slogdet(s)
+    if sign <= 0:
+        raise ValueError("표본 공분산 행렬이 양의 정부호가 아닙니다 (응답 수 부족 또는 상수 문항)")
+    x, f, converged, iters = _bfgs(lambda v: _objective(v, s, logdet_s),
+                                   start_values(s) if x0 is None else x0)
+    x = _align_signs(x)
+    lam, phi, theta = _unpack(x)
+    sigma = implied_cov(x)
+
+    chi2 = (n - 1) * f
+    # 독립 모형(대각 Σ)의 χ² → CFI 기준
+    chi2_base = (n - 1) * (np.log(np.diag(s)).sum() - logdet_s)
+    df_base = P * (P - 1) // 2
+    d_model = max(chi2 - DF, 0.0)
+    d_base = max(chi2_base - df_base, d_model, 0.0)
+    cfi = 1.0 - d_model / d_base if d_base > 0 else 1.0
+    rmsea = float(np.sqrt(d_model / (DF * (n - 1))))
+    sd = np.sqrt(np.diag(s))
+    resid = (s - sigma) / np.outer(sd, sd)
+    srmr = float(np.sqrt(np.mean(resid[np.tril_indices(P)] ** 2)))
+
+    std_loadings = lam[np.arange(P), ITEM_FACTOR] / np.sqrt(np.diag(sigma))
+    return {
+        "n": int(n),
+        "converged": converged,
+        "iterations": iters,
+        "chi2": float(chi2),
+        "df": DF,
+        "cfi": float(cfi),
+        "rmsea": rmsea,
+        "srmr": srmr,
+        "loadings": lam[np.arange(P), ITEM_FACTOR].tolist(),
+        "std_loadings": std_loadings.tolist(),
+        "factor_corr": {f"{FACTORS[a]}-{FACTORS[b]}": float(phi[a, b]) for a, b in PHI_PAIRS},
+        "uniqueness": theta.tolist(),
+        "_x": x,
+    }
+
+
+def fit(answers: np.ndarray) -> dict:
+    answers = np.asarray(answers)
+    return fit_cov(sample_cov(answers), len(answers))
+
+
+# =========================
+# 부트스트랩 (프로세스 풀)
+# =========================
+_data = None   # 작업 프로세스 전역: 응답 행렬
+_start = None  # 작업 프로세스 전역: 전체 표본 추정값 (재표집 적합의 시작점)
+
+
+def _init_worker(answers: np.ndarray, x0: np.ndarray):
+    global _data, _start
+    _data, _start = answers, x0
+
+
+def _boot_chunk(seeds: list) -> list:
+    # 재표집 1회 = SeedSequence 자식 1개 → 어떤 프로세스에서 돌든 같은 표본
+    out = []
+    n = len(_data)
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        sample = _data[rng.integers(0, n, size=n)]
+        try:
+            r = fit_cov(sample_cov(sample), n, _start)
+        except ValueError:
+            out.append(None)
+            continue
+        vec = r["std_loadings"] + list(r["factor_corr"].values()) + [r["cfi"], r["rmsea"], r["srmr"]]
+        out.append(vec if r["converged"] else None)
+    return out
+
+
+def _stat_names() -> list:
+    return ([f"q{i + 1}" for i in ITEMS] + [f"{FACTORS[a]}-{FACTORS[b]}" for a, b in PHI_PAIRS]
+            + ["cfi", "rmsea", "srmr"])
+
+
+def bootstrap(answers: np.ndarray, n_boot: int = 2000, seed: int = SEED, workers: int = None,
+              level: float = 0.95, x0: np.ndarray = None, chunk: int = 25) -> dict:
+    answers = np.ascontiguousarray(answers, dtype=np.int8)
+    if x0 is None:
+        x0 = fit(answers)["_x"]
+    seeds = np.random.SeedSequence(seed).spawn(n_boot)
+    chunks = [seeds[i:i + chunk] for i in range(0, n_boot, chunk)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(answers, x0)) as pool:
+        for part in pool.map(_boot_chunk, chunks):
+            results.extend(part)
+
+    ok = np.array([r for r in results if r is not None])
+    lo, hi = (1 - level) / 2 * 100, (1 + level) / 2 * 100
+    ci = {}
+    if len(ok):
+        for name, col in zip(_stat_names(), ok.T):
+            ci[name] = [float(np.percentile(col, lo)), float(np.percentile(col, hi))]
+    return {"n_boot": n_boot, "ok": int(len(ok)), "failed": n_boot - int(len(ok)),
+            "seed": seed, "level": level, "ci": ci}
+
+
+# =========================
+# CLI
+# =========================
+def _print(result: dict, boot: dict = None):
+    ci = boot["ci"] if boot else {}
+
+    def fmt(v, name):
+        s = f"{v:8.3f}"
+        if name in ci:
+            s += f"  [{ci[name][0]:6.3f}, {ci[name][1]:6.3f}]"
+        return s
+
+    print(f"n={result['n']}  converged={result['converged']} ({result['iterations']} iter)")
+    print(f"chi2={result['chi2']:.1f}  df={result['df']}")
+    for name in ["cfi", "rmsea", "srmr"]:
+        print(f"{name.upper():<6}{fmt(result[name], name)}")
+    print("\n표준화 적재값")
+    for k, i in enumerate(ITEMS):
+        name = f"q{i + 1}"
+        print(f"  {name:<4} {FACTORS[ITEM_FACTOR[k]]}  {fmt(result['std_loadings'][k], name)}")
+    print("\n요인 상관")
+    for name, v in result["factor_corr"].items():
+        print(f"  {name:<6}{fmt(v, name)}")
+    if boot:
+        print(f"\nbootstrap: {boot['ok']}/{boot['n_boot']} fits converged, seed={boot['seed']}, "
+              f"{boot['level']:.0%} percentile CI")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="감·수·성 3요인 확인적 요인분석 (ML, 부트스트랩 신뢰구간)")
+    parser.add_argument("source", help='응답 출처: CSV 경로 | "outbox" | "outbox:<경로>" | "sheet" | "cache" | "cache:<경로>"')
+    parser.add_argument("--boot", type=int, default=0, help="부트스트랩 재표집 횟수 (0: 생략)")
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--level", type=float, default=0.95, help="신뢰수준")
+    parser.add_argument("--json", default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    answers = responses.answers_matrix(responses.complete_rows(responses.load(args.source)))
+    if len(answers) <= P:
+        parser.error(f"응답 수가 너무 적습니다: {len(answers)}건")
+
+    started = time.perf_counter()
+    result = fit(answers)
+    boot = None
+    if args.boot:
+        boot = bootstrap(answers, args.boot, args.seed, args.workers, args.level, x0=result["_x"])
+    elapsed = time.perf_counter() - started
+
+    _print(result, boot)
+    print(f"\n{elapsed:.1f}s ({os.cpu_count()} CPUs)", file=sys.stderr)
+    if args.json:
+        out = {k: v for k, v in result.items() if not k.startswith("_")}
+        out["items"] = [f"q{i + 1}" for i in ITEMS]
+        out["bootstrap"] = boot
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(out, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
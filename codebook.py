@@ -0,0 +1,37 @@
+# =========================
+# 인구학 정보 → 숫자 코드 매핑 (sheet1 저장 값)
+# - app.py 제출 저장과 cohort_reports.py 집단별 보고서가 같은 표를 사용
+# - 코드 값은 이미 저장된 응답과 연결되므로 바꾸지 말고 항목 추가만 할 것
+# =========================
+AGE_MAP = {"20대": 1, "30대": 2, "40대": 3, "50대": 4}
+GENDER_MAP = {"남성": 1, "여성": 2}
+CAREER_MAP = {"5년 미만": 1, "5~10년 미만": 2, "10~20년 미만": 3, "20년 이상": 4}
+JOBTYPE_MAP = {
+    "심리치료과(팀)/의료과": 1,
+    "보안 일근": 2,
+    "보안 야근": 3,
+    "기타 부서": 9
+    }
+FACIL_MAP = {"교도소": 1, "구치소": 2, "소년시설": 3, "치료감호/의료": 4, "기타": 9}
+EDU_HR_MAP = {"전혀 없음": 0, "1회": 1, "2~3회": 2, "4회 이상": 3}
+EDU_MENTAL_MAP = {"없다": 0, "1회": 1, "2회 이상": 2}
+EXPOSURE_MAP = {"거의 없음": 0, "가끔": 1, "자주": 2, "매우 자주": 3}
+BURNOUT_DETACH_MAP = {"전혀 아니다": 1, "대체로 아니다": 2, "대체로 그렇다": 3, "매우 그렇다": 4}
+
+# sheet1 컬럼 이름 → 매핑 (responses.DEMO_COLUMNS 순서)
+COLUMN_MAPS = {
+    "연령대": AGE_MAP,
+    "성별": GENDER_MAP,
+    "경력": CAREER_MAP,
+    "직무": JOBTYPE_MAP,
+    "기관": FACIL_MAP,
+    "인권교육": EDU_HR_MAP,
+    "정신교육": EDU_MENTAL_MAP,
+    "대면빈도": EXPOSURE_MAP,
+    "직무소진_거리두기": BURNOUT_DETACH_MAP,
+}
+
+
+def code_labels(column: str) -> dict:
+    # 저장된 코드 → 화면 문구 (보고서 표기용)
+    return {code: label for label, code in COLUMN_MAPS[column].items()}
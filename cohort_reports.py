@@ -0,0 +1,293 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+import batch_pdf
+import codebook
+import responses
+import scoring
+
+# =========================
+# 집단별(기관·직무·경력) 요약 보고서 PDF 일괄 생성 (관리자용)
+# 예) python cohort_reports.py responses.csv --out reports/ --workers 4
+#     python cohort_reports.py sheet --out reports/ --by 기관 --min-n 10
+# - 저장된 응답을 한 번 읽어 score_batch 로 채점 → 집단별 요약 통계를 먼저 계산
+# - 작은 요약 dict 만 작업 프로세스에 넘겨 집단마다 PDF 1개 생성 (글꼴/레이더는 result_pdf 공용)
+# - 출력 디렉터리에 PDF 와 manifest.json(파일, 응답 수, sha256, 제외된 집단) 기록
+# - 응답 수가 min_n 보다 적은 집단은 개인이 드러날 수 있어 보고서를 만들지 않음
+# =========================
+GROUP_COLUMNS = ["기관", "직무", "경력"]
+GROUP_SLUGS = {"기관": "facility", "직무": "jobtype", "경력": "career"}  # 파일 이름용
+MIN_N = 5
+MANIFEST = "manifest.json"
+
+STAT_KEYS = [("total", "총점"), ("감", "감"), ("수", "수"), ("성", "성"), ("정신", "정신질환 9문항")]
+TOTAL_BINS = [27, 36, 45, 54, 63, 72, 81, 90, 99, 109]  # 총점 구간 경계 (27~108점)
+
+
+# =========================
+# 집단 나누기 · 요약 (부모 프로세스, numpy)
+# =========================
+def _describe(values: np.ndarray) -> dict:
+    return {
+        "mean": round(float(values.mean()), 2),
+        "sd": round(float(values.std(ddof=1)), 2) if len(values) > 1 else 0.0,
+        "min": int(values.min()),
+        "median": float(np.median(values)),
+        "max": int(values.max()),
+    }
+
+
+def summarize(b: dict, idx: np.ndarray) -> dict:
+    n_types = len(scoring.TYPE_KEYS)
+    return {
+        "n": int(len(idx)),
+        "stats": {k: _describe(b[k][idx]) for k, _ in STAT_KEYS},
+        "radar": [round(float(b[k][idx].mean()), 2) for k in ("감", "수", "성")],
+        "radar_mh": [round(float(b[k][idx].mean()), 2) for k in ("mh_gam", "mh_su", "mh_seong")],
+        "total_hist": np.histogram(b["total"][idx], bins=TOTAL_BINS)[0].tolist(),
+        "main_mix": np.bincount(b["main_type_idx"][idx], minlength=n_types).tolist(),
+        "mh_mix": np.bincount(b["mh_type_idx"][idx], minlength=n_types).tolist(),
+    }
+
+
+def build_groups(rows: list, columns: list, min_n: int = MIN_N) -> tuple:
+    # -> (보고서 작업 목록, 제외된 집단 목록)
+    b = scoring.score_batch(responses.answers_matrix(rows))
+    overall = summarize(b, np.arange(len(rows)))
+
+    reports = [{"file": "all.pdf", "column": None, "code": None, "label": "전체 응답자", "summary": overall}]
+    skipped = []
+    for column in columns:
+        codes = np.array([-1 if r[column] is None else r[column] for r in rows])
+        labels = codebook.code_labels(column)
+        present = sorted(set(codes.tolist()) - {-1} - set(labels))  # 코드표에 없는 값도 따로 보고
+        for code in list(labels) + present:
+            idx = np.flatnonzero(codes == code)
+            label = labels.get(code, f"코드 {code}")
+            if len(idx) < min_n:
+                skipped.append({"column": column, "code": code, "label": label, "n": int(len(idx))})
+                continue
+            reports.append({
+                "file": f"{GROUP_SLUGS.get(column, column)}_{code}.pdf",
+                "column": column,
+                "code": code,
+                "label": label,
+                "summary": summarize(b, idx),
+            })
+    for report in reports:
+        report["overall"] = overall
+    return reports, skipped
+
+
+# =========================
+# PDF (작업 프로세스)
+# =========================
+def _render(report: dict) -> tuple:
+    from io import BytesIO
+
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.pdfgen import canvas
+
+    import result_pdf
+    from result_pdf import FONT_NAME, MARGIN_X, MARGIN_Y, PAGE_WIDTH, TOP_Y, RADAR_SERIES_COLORS
+
+    result_pdf.init_fonts()
+    s, overall = report["summary"], report["overall"]
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    y = TOP_Y
+
+    title = "전체 응답자" if report["column"] is None else f"{report['column']}: {report['label']}"
+    c.setFont(FONT_NAME, 16)
+    c.drawString(MARGIN_X, y, f"감·수·성 집단 요약 보고서 — {title}")
+    y -= 8 * mm
+    c.setFont(FONT_NAME, 9)
+    c.drawString(MARGIN_X, y, f"응답 수: {s['n']}명 (전체 {overall['n']}명)  |  자료: {report['source']}  |  생성: {report['generated']}")
+    y -= 10 * mm
+
+    # 1) 점수 요약 표
+    c.setFont(FONT_NAME, 11)
+    c.drawString(MARGIN_X, y, "1. 점수 분포")
+    y -= 7 * mm
+    cols = [MARGIN_X, MARGIN_X + 38 * mm, MARGIN_X + 58 * mm, MARGIN_X + 78 * mm,
+            MARGIN_X + 98 * mm, MARGIN_X + 118 * mm, MARGIN_X + 138 * mm]
+    c.setFont(FONT_NAME, 9)
+    for x, head in zip(cols, ["구분", "평균", "표준편차", "최솟값", "중앙값", "최댓값", "전체 평균"]):
+        c.drawString(x, y, head)
+    y -= 2 * mm
+    c.setStrokeColor(colors.HexColor("#808080"))
+    c.setLineWidth(0.4)
+    c.line(MARGIN_X, y, PAGE_WIDTH - MARGIN_X, y)
+    y -= 5 * mm
+    for key, name in STAT_KEYS:
+        st_ = s["stats"][key]
+        cells = [name, f"{st_['mean']:.1f}", f"{st_['sd']:.1f}", str(st_["min"]),
+                 f"{st_['median']:g}", str(st_["max"]), f"{overall['stats'][key]['mean']:.1f}"]
+        for x, cell in zip(cols, cells):
+            c.drawString(x, y, cell)
+        y -= 5 * mm
+    y -= 4 * mm
+
+    # 2) 레이더: 이 집단 평균 vs 전체 평균 (왼쪽 27문항, 오른쪽 정신질환 상황 9문항)
+    c.setFont(FONT_NAME, 11)
+    c.drawString(MARGIN_X, y, "2. 요인 평균 프로파일")
+    y -= 4 * mm
+    size = 55 * mm
+    chart_y = y - size
+    half = (PAGE_WIDTH - 2 * MARGIN_X) / 2
+    # 축 최대값은 요인 범위에 맞춤: 27문항 9~36점, 정신질환 상황 9문항 3~12점
+    for k, (caption, key, top) in enumerate([
+        ("전체 27문항", "radar", result_pdf.RADAR_MAX),
+        ("정신질환 상황 9문항", "radar_mh", result_pdf.RADAR_MAX_MH),
+    ]):
+        x = MARGIN_X + k * half + (half - size) / 2
+        result_pdf.draw_radar(c, x, chart_y, size, s[key], overall[key], max_value=top)
+        c.setFont(FONT_NAME, 9)
+        c.drawCentredString(x + size / 2, chart_y - 2 * mm, caption)
+    y = chart_y - 8 * mm
+    c.setFont(FONT_NAME, 8)
+    for k, (name, color) in enumerate(zip(["이 집단 평균", "전체 응답자 평균"], RADAR_SERIES_COLORS)):
+        x = MARGIN_X + k * 40 * mm
+        c.setFillColor(color)
+        c.rect(x, y - 0.5 * mm, 3 * mm, 3 * mm, stroke=0, fill=1)
+        c.setFillColor(colors.black)
+        c.drawString(x + 5 * mm, y, name)
+    y -= 10 * mm
+
+    # 3) 총점 구간별 분포 (막대)
+    c.setFont(FONT_NAME, 11)
+    c.drawString(MARGIN_X, y, "3. 총점 구간별 응답 수")
+    y -= 6 * mm
+    hist = s["total_hist"]
+    bar_h, bar_w = 3.2 * mm, 90 * mm
+    peak = max(hist) or 1
+    c.setFont(FONT_NAME, 8)
+    for k, count in enumerate(hist):
+        lo, hi = TOTAL_BINS[k], TOTAL_BINS[k + 1] - 1
+        c.setFillColor(colors.black)
+        c.drawString(MARGIN_X, y, f"{lo}~{hi}점")
+        c.setFillColor(RADAR_SERIES_COLORS[0])
+        c.rect(MARGIN_X + 20 * mm, y - 0.5 * mm, bar_w * count / peak, bar_h - 0.8 * mm, stroke=0, fill=1)
+        c.setFillColor(colors.black)
+        c.drawString(MARGIN_X + 22 * mm + bar_w * count / peak, y, str(count))
+        y -= bar_h + 0.6 * mm
+    y -= 6 * mm
+
+    # 4) 유형 구성 (전체 유형 / 정신질환 상황 유형, 코드 함께 표기)
+    c.setFont(FONT_NAME, 11)
+    c.drawString(MARGIN_X, y, "4. 유형 구성")
+    y -= 6 * mm
+    c.setFont(FONT_NAME, 8)
+    for k, (caption, mix, codes) in enumerate([
+        ("전체(27문항) 유형", s["main_mix"], scoring.TYPE_CODE_MAIN),
+        ("정신질환 상황(9문항) 유형", s["mh_mix"], scoring.TYPE_CODE_MH),
+    ]):
+        x = MARGIN_X + k * half
+        row_y = y
+        c.drawString(x, row_y, caption)
+        row_y -= 5 * mm
+        for type_key, count in zip(scoring.TYPE_KEYS, mix):
+            pct = count / s["n"] * 100
+            c.drawString(x, row_y, f"{scoring.TYPE_NAMES[type_key]} ({codes[type_key]})")
+            c.drawRightString(x + 45 * mm, row_y, f"{count}명")
+            c.drawRightString(x + 60 * mm, row_y, f"{pct:.1f}%")
+            row_y -= 4.5 * mm
+
+    c.setFont(FONT_NAME, 8)
+    c.drawString(
+        MARGIN_X, MARGIN_Y,
+        f"※ 집단 요약 자료이며 개인 평가·인사 자료로 사용할 수 없습니다. 응답 {report['min_n']}명 미만 집단은 보고서를 만들지 않습니다."
+    )
+    c.save()
+    return report["file"], buffer.getvalue()
+
+
+# =========================
+# 실행
+# =========================
+def _previous_files(out: str) -> set:
+    try:
+        with open(os.path.join(out, MANIFEST), encoding="utf-8") as f:
+            return {r["file"] for r in json.load(f)["reports"]}
+    except (OSError, ValueError, KeyError):
+        return set()
+
+
+def run(source: str, out: str, columns: list = None, workers: int = None, min_n: int = MIN_N) -> dict:
+    started = time.perf_counter()
+    rows = responses.complete_rows(responses.load(source))
+    if not rows:
+        raise ValueError(f"채점 가능한 응답이 없습니다: {source}")
+    reports, skipped = build_groups(rows, columns or GROUP_COLUMNS, min_n)
+
+    generated = time.strftime("%Y-%m-%d %H:%M:%S")
+    for report in reports:
+        report.update(source=source, generated=generated, min_n=min_n)
+
+    os.makedirs(out, exist_ok=True)
+    stale = _previous_files(out)
+    entries = []
+    # PDF 생성은 batch_pdf.py 와 같은 작업 프로세스 풀에서 (폰트 등록/예열을 끝낸 프로세스)
+    with batch_pdf.process_pool(workers) as pool:
+        for report, (name, data) in zip(reports, pool.map(_render, reports)):
+            with open(os.path.join(out, name), "wb") as f:
+                f.write(data)
+            stale.discard(name)
+            entries.append({
+                "file": name,
+                "column": report["column"],
+                "code": report["code"],
+                "label": report["label"],
+                "n": report["summary"]["n"],
+                "bytes": len(data),
+                "sha256": hashlib.sha256(data).hexdigest(),
+            })
+    # 이전 실행에서 만들었지만 이번에는 없는 보고서(집단이 min_n 미만이 된 경우 등)는 삭제
+    for name in stale:
+        try:
+            os.remove(os.path.join(out, name))
+        except FileNotFoundError:
+            pass
+
+    manifest = {
+        "generated": generated,
+        "source": source,
+        "respondents": len(rows),
+        "columns": columns or GROUP_COLUMNS,
+        "min_n": min_n,
+        "reports": entries,
+        "skipped": skipped,
+    }
+    tmp = os.path.join(out, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, os.path.join(out, MANIFEST))
+
+    elapsed = time.perf_counter() - started
+    print(f"{len(entries)} reports ({len(skipped)} groups skipped, n<{min_n}) "
+          f"from {len(rows)} responses in {elapsed:.1f}s → {out}", file=sys.stderr)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="감·수·성 집단별 요약 보고서 PDF 생성")
+    parser.add_argument("source", help='응답 출처: CSV 경로 | "outbox" | "outbox:<경로>" | "sheet" | "cache" | "cache:<경로>"')
+    parser.add_argument("--out", required=True, help="출력 디렉터리 (PDF + manifest.json)")
+    parser.add_argument("--by", nargs="+", default=GROUP_COLUMNS, choices=GROUP_COLUMNS,
+                        help="집단 기준 컬럼 (기본: 기관 직무 경력)")
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--min-n", type=int, default=MIN_N, help="보고서를 만들 최소 응답 수")
+    args = parser.parse_args(argv)
+    run(args.source, args.out, args.by, args.workers, args.min_n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+import argparse
+import csv
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import csv_store
+from perception_schema import ALL_COLUMNS, CATEGORIES, COLUMN_GROUPS, ITEM_COLUMNS
+
+# =========================
+# perception_app 컬럼형(Parquet) 저장소
+# - 일자별 파티션: <root>/date=YYYY-MM-DD/part-*.parquet
+# - 척도 문항은 int8, 선택형 문항은 고정 보기 목록으로 사전(dictionary) 인코딩
+# - 분석 시 필요한 컬럼 그룹(perception_schema.COLUMN_GROUPS)만 읽음
+# - 제출마다 파일 1개 → 파티션 파일이 COMPACT_FILES 개가 되면 제출 시 자동 병합
+#   (읽기 비용이 파일 수에 비례하므로 파티션당 파일 수를 일정 이하로 유지)
+# - 병합은 새 제출 파일(part-*)만 합쳐 compacted-* 하나로 → 하루치 전체를 매번 다시 쓰지 않음
+#   compacted 파일이 COMPACT_FILES 개가 되면 그때 compacted 끼리 한 번 더 병합
+# - 병합 파일의 Parquet 메타데이터(covers)에 합친 원본 파일 이름을 기록
+#   → 읽기는 다른 파일이 덮은(covers) 파일을 건너뜀: 병합 파일 이름 교체(os.replace) 한 번이 곧 교체 시점
+#   → 원본 삭제 전에 중단돼도 중복 행이 보이지 않고, 남은 원본은 다음 병합 때 지움
+# =========================
+STORE_ROOT = os.environ.get("PERCEPTION_STORE_ROOT", "perception_store")
+COMPRESSION = "zstd"
+COMPACT_FILES = int(os.environ.get("PERCEPTION_COMPACT_FILES", "32"))
+COVERS_KEY = b"covers"  # 병합 파일 메타데이터: 합친 원본 파일 이름 목록 (JSON)
+
+_ITEM_SET = set(ITEM_COLUMNS)
+_SHORT_INT = {"age", "years"}
+
+
+def _field(name: str) -> pa.Field:
+    if name in _ITEM_SET:
+        return pa.field(name, pa.int8())
+    if name in CATEGORIES:
+        return pa.field(name, pa.dictionary(pa.int8(), pa.string()))
+    if name in _SHORT_INT:
+        return pa.field(name, pa.int16())
+    if name == "timestamp":
+        return pa.field(name, pa.timestamp("us"))
+    return pa.field(name, pa.string())
+
+
+SCHEMA = pa.schema([_field(c) for c in ALL_COLUMNS])
+PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+DATASET_SCHEMA = SCHEMA.append(pa.field("date", pa.string()))
+
+
+def _to_int(v):
+    if v is None or v == "":
+        return None
+    return int(float(v))
+
+
+def _to_timestamp(v):
+    if v is None or v == "":
+        return None
+    if isinstance(v, datetime):
+        return v
+    return datetime.fromisoformat(v)
+
+
+def _column(field: pa.Field, values: list) -> pa.Array:
+    name = field.name
+    if name in CATEGORIES:
+        # 보기 목록 순서가 곧 코드 → 모든 파일에서 같은 사전 사용
+        options = CATEGORIES[name]
+        lookup = {o: i for i, o in enumerate(options)}
+        indices = pa.array([lookup.get(v) for v in values], type=pa.int8())
+        return pa.DictionaryArray.from_arrays(indices, pa.array(options, type=pa.string()))
+    if pa.types.is_integer(field.type):
+        return pa.array([_to_int(v) for v in values], type=field.type)
+    if pa.types.is_timestamp(field.type):
+        return pa.array([_to_timestamp(v) for v in values], type=field.type)
+    return pa.array([None if v is None else str(v) for v in values], type=field.type)
+
+
+def to_table(records: list) -> pa.Table:
+    return pa.Table.from_arrays(
+        [_column(f, [r.get(f.name) for r in records]) for f in SCHEMA],
+        schema=SCHEMA,
+    )
+
+
+def _partition_dir(root: str, date: str) -> str:
+    return os.path.join(root, f"date={date}")
+
+
+def _write_atomic(table: pa.Table, directory: str, prefix: str, covers: list = None) -> str:
+    os.makedirs(directory, exist_ok=True)
+    name = f"{prefix}-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+    if covers:
+        meta = dict(table.schema.metadata or {})
+        meta[COVERS_KEY] = json.dumps(sorted(covers)).encode("utf-8")
+        table = table.replace_schema_metadata(meta)
+    # '_' 로 시작하는 파일은 읽기에서 무시됨 → 쓰는 도중 파일이 보이지 않음
+    tmp = os.path.join(directory, "_" + name)
+    pq.write_table(table, tmp, compression=COMPRESSION)
+    path = os.path.join(directory, name)
+    os.replace(tmp, path)
+    return path
+
+
+def _covers(path: str) -> list:
+    meta = pq.read_schema(path).metadata or {}
+    return json.loads(meta[COVERS_KEY]) if COVERS_KEY in meta else []
+
+
+def _scan(directory: str) -> tuple:
+    # 파티션 파일 → (읽을 part, 읽을 compacted, 이미 다른 파일이 덮은 파일) — 모두 전체 경로
+    names = sorted(
+        f for f in os.listdir(directory)
+        if f.endswith(".parquet") and not f.startswith("_")
+    )
+    covered = set()
+    for f in names:
+        if f.startswith("compacted-"):
+            covered.update(_covers(os.path.join(directory, f)))
+    parts, compacted, stale = [], [], []
+    for f in names:
+        bucket = stale if f in covered else compacted if f.startswith("compacted-") else parts
+        bucket.append(os.path.join(directory, f))
+    return parts, compacted, stale
+
+
+def _parts(directory: str) -> list:
+    # 읽기 대상 파일 (덮인 파일 제외)
+    parts, compacted, _ = _scan(directory)
+    return sorted(parts + compacted)
+
+
+def append_record(record: dict, root: str = None) -> str:
+    root = root or STORE_ROOT
+    date = (_to_timestamp(record.get("timestamp")) or datetime.now()).date().isoformat()
+    path = _write_atomic(to_table([record]), _partition_dir(root, date), "part")
+    # 이름만 세어 판단 (병합 파일 메타데이터는 읽지 않음)
+    parts = [f for f in os.listdir(os.path.dirname(path)) if f.startswith("part-")]
+    if COMPACT_FILES and len(parts) >= COMPACT_FILES:
+        compact(root, [date])
+    return path
+
+
+def append_records(records: list, root: str = None) -> list:
+    # 여러 건을 일자별로 나눠 파티션당 파일 하나로 기록 (CSV 이관 등)
+    root = root or STORE_ROOT
+    by_date = {}
+    for rec in records:
+        ts = _to_timestamp(rec.get("timestamp")) or datetime.now()
+        by_date.setdefault(ts.date().isoformat(), []).append(rec)
+    return [
+        _write_atomic(to_table(recs), _partition_dir(root, date), "part")
+        for date, recs in sorted(by_date.items())
+    ]
+
+
+def compact(root: str = None, dates: list = None, full: bool = False) -> dict:
+    # 제출마다 생기는 작은 파일들을 병합 (full: compacted 까지 일자별 파일 하나로)
+    # - 파티션별 잠금 → 여러 세션/프로세스가 동시에 자동 병합해도 같은 파일을 두 번 합치지 않음
+    root = root or STORE_ROOT
+    if dates is None:
+        dates = [d.split("=", 1)[1] for d in sorted(os.listdir(root)) if d.startswith("date=")]
+    merged = {}
+    for date in dates:
+        directory = _partition_dir(root, date)
+        # '_' 로 시작 → 읽기에서 무시되는 잠금 파일
+        with csv_store.locked(os.path.join(directory, "_compact")):
+            parts, compacted, stale = _scan(directory)  # 잠금 안에서 다시 나열
+            for p in stale:
+                os.remove(p)  # 지난 병합이 지우기 전에 중단된 원본
+            inputs = parts
+            if full or (COMPACT_FILES and len(compacted) + 1 >= COMPACT_FILES):
+                inputs = parts + compacted
+            if len(inputs) < 2:
+                continue
+            table = pa.concat_tables(pq.read_table(p, schema=SCHEMA) for p in inputs)
+            # 이 파일이 보이는 순간부터 inputs 는 읽기에서 제외 → 이후 삭제는 정리일 뿐
+            _write_atomic(table, directory, "compacted", [os.path.basename(p) for p in inputs])
+            for p in inputs:
+                os.remove(p)
+        merged[date] = len(inputs)
+    return merged
+
+
+def _files(root: str, dates: list = None) -> list:
+    dirs = sorted(d for d in os.listdir(root) if d.startswith("date=")) if os.path.isdir(root) else []
+    if dates:
+        dirs = [d for d in dirs if d.split("=", 1)[1] in dates]
+    return [p for d in dirs for p in _parts(os.path.join(root, d))]
+
+
+def dataset(root: str = None, dates: list = None) -> ds.Dataset:
+    # 덮인 파일을 뺀 목록으로 구성 (디렉터리 전체를 읽으면 병합 직후 중복 행이 보일 수 있음)
+    root = root or STORE_ROOT
+    return ds.dataset(
+        _files(root, dates), format="parquet", partitioning=PARTITIONING,
+        partition_base_dir=root, schema=DATASET_SCHEMA,
+    )
+
+
+def group_columns(groups) -> list:
+    cols = []
+    for g in groups:
+        for c in COLUMN_GROUPS[g]:
+            if c not in cols:
+                cols.append(c)
+    return cols
+
+
+def load(groups=("META",), root: str = None, dates: list = None, columns: list = None) -> pa.Table:
+    # 예) load(["BO"]) → K-BAT 22문항만 읽음 (다른 컬럼은 디스크에서 읽지 않음)
+    cols = ["timestamp"] + [c for c in (columns or group_columns(groups)) if c != "timestamp"]
+    for attempt in range(3):
+        try:
+            return dataset(root, dates).to_table(columns=cols)
+        except FileNotFoundError:
+            # 목록을 만든 뒤 동시 병합이 원본을 지움 → 목록부터 다시
+            if attempt == 2:
+                raise
+
+
+def read_csv_records(csv_path: str) -> list:
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f))
+
+
+# =========================
+# CLI: python columnar_store.py {compact,load,import-csv}
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="perception_app 컬럼형 저장소 관리")
+    parser.add_argument("--root", default=STORE_ROOT)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("compact", help="일자별 작은 파일 병합")
+    p.add_argument("--date", action="append", help="YYYY-MM-DD (여러 번 지정 가능, 생략 시 전체)")
+    p.add_argument("--full", action="store_true", help="병합 파일까지 일자별 파일 하나로")
+
+    p = sub.add_parser("load", help="컬럼 그룹을 읽어 건수와 소요시간 출력")
+    p.add_argument("--group", action="append", choices=list(COLUMN_GROUPS), required=True)
+    p.add_argument("--date", action="append")
+
+    p = sub.add_parser("import-csv", help="기존 CSV 응답을 저장소로 이관")
+    p.add_argument("csv_path")
+
+    args = parser.parse_args(argv)
+    if args.command == "compact":
+        for date, n in compact(args.root, args.date, args.full).items():
+            print(f"{date}: {n} files merged")
+    elif args.command == "load":
+        t0 = time.perf_counter()
+        table = load(args.group, args.root, args.date)
+        elapsed = (time.perf_counter() - t0) * 1000
+        print(f"{table.num_rows} rows x {table.num_columns} columns in {elapsed:.1f} ms")
+    elif args.command == "import-csv":
+        paths = append_records(read_csv_records(args.csv_path), args.root)
+        print(f"{len(paths)} partition files written")
+
+
+if __name__ == "__main__":
+    main()
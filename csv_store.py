@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# =========================
+# append-only CSV 저장 (perception_app)
+# - 파일 잠금 후 한 줄만 추가 → 파일 크기와 무관하게 제출 비용 일정
+# - 컬럼 순서는 <csv>.columns.json (manifest) 에 보관
+# - 새 컬럼이 생기면(문항 추가 등) manifest 를 늘리고 헤더를 한 번만 다시 씀
+# =========================
+ENCODING = "utf-8"
+BOM = "\ufeff".encode(ENCODING)  # 기존 to_csv(encoding="utf-8-sig")와 동일하게 엑셀 호환
+
+
+def manifest_path(csv_path: str) -> str:
+    return csv_path + ".columns.json"
+
+
+@contextmanager
+def locked(csv_path: str):
+    # 데이터 파일과 별도의 잠금 파일 사용 (헤더 재작성 시 os.replace 와 충돌 방지)
+    with open(csv_path + ".lock", "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _encode(values: list) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerow(["" if v is None else v for v in values])
+    return buf.getvalue().encode(ENCODING)
+
+
+def _read_header(csv_path: str):
+    try:
+        with open(csv_path, newline="", encoding="utf-8-sig") as f:
+            return next(csv.reader(f), None)
+    except FileNotFoundError:
+        return None
+
+
+def load_columns(csv_path: str):
+    try:
+        with open(manifest_path(csv_path), encoding=ENCODING) as f:
+            return json.load(f)["columns"]
+    except FileNotFoundError:
+        # manifest 도입 이전 파일: 헤더 한 줄만 읽어서 manifest 로 사용
+        return _read_header(csv_path)
+
+
+def _write_manifest(csv_path: str, columns: list):
+    tmp = manifest_path(csv_path) + ".tmp"
+    with open(tmp, "w", encoding=ENCODING) as f:
+        json.dump({"columns": columns}, f, ensure_ascii=False)
+    os.replace(tmp, manifest_path(csv_path))
+
+
+def _rewrite_with_columns(csv_path: str, columns: list):
+    # 스키마 변경 시에만 호출(드묾): 기존 행을 새 컬럼 순서로 채워 다시 씀
+    tmp = csv_path + ".tmp"
+    with open(csv_path, newline="", encoding="utf-8-sig") as src, open(tmp, "wb") as dst:
+        dst.write(BOM + _encode(columns))
+        for rec in csv.DictReader(src):
+            dst.write(_encode([rec.get(c) for c in columns]))
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(tmp, csv_path)
+
+
+def append_record(csv_path: str, record: dict):
+    with locked(csv_path):
+        columns = load_columns(csv_path) or []
+        has_rows = os.path.exists(csv_path) and os.path.getsize(csv_path) > 0
+
+        added = [k for k in record if k not in columns]
+        if added:
+            columns = columns + added
+            if has_rows:
+                _rewrite_with_columns(csv_path, columns)
+        if added or not os.path.exists(manifest_path(csv_path)):
+            _write_manifest(csv_path, columns)
+
+        with open(csv_path, "ab") as f:
+            if f.tell() == 0:
+                f.write(BOM + _encode(columns))
+            f.write(_encode([record.get(c) for c in columns]))
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,361 @@
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# =========================
+# 동시 응답자 부하 테스트 (헤드리스, streamlit AppTest)
+# 예) python loadtest.py survey --users 20
+#     python loadtest.py perception --users 50 --ramp 10 --json result.json
+# - 응답자 1명 = AppTest 세션 1개, N명을 스레드로 동시에 진행
+#   (실제 서버처럼 한 프로세스 안에서 GIL/메모리를 나눠 씀)
+# - Google Sheets 는 로컬 stub 으로 대체 (--sheet-latency 만큼 지연만 흉내)
+# - 페이지별 rerun 지연 p50/p95/p99, 초당 제출 수, 최대 RSS 출력
+# - app.py 문항 응답은 실제 서버와 같은 keyed fragment 경로(on_answer → st.rerun(targets))로 실행됨
+#   → profiling 계측을 켜서 fragment 단독 rerun 횟수/시간을 함께 출력하고, 한 번도 없으면 오류로 보고
+# =========================
+HERE = os.path.dirname(os.path.abspath(__file__))
+SURVEY_APP = os.path.join(HERE, "app.py")
+PERCEPTION_APP = os.path.join(HERE, "perception_app.py")
+
+DEMOGRAPHIC = {
+    "age": "30대", "gender": "남성", "career": "5년 미만", "jobtype": "보안 일근",
+    "facil": "교도소", "edu_hr": "1회", "edu_mental": "없다", "exposure": "가끔",
+    "burnout_detach": "대체로 그렇다",
+}
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = defaultdict(list)  # page -> [초]
+        self.submits = 0
+        self.errors = Counter()
+
+    def run(self, at, page: str):
+        # 위젯 조작 후 rerun 1회 실행, 소요시간을 페이지별로 기록
+        t0 = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - t0
+        with self._lock:
+            self.latency[page].append(elapsed)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return at
+
+    def submitted(self):
+        with self._lock:
+            self.submits += 1
+
+    def failed(self, error: str):
+        with self._lock:
+            self.errors[error] += 1
+
+
+class SheetStub:
+    # sheets.append_rows / append_row 대체: 지연만 흉내 내고 받은 행 수를 셈
+    def __init__(self, latency: float):
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.rows = Counter()
+
+    def append_rows(self, worksheet_name: str, rows: list):
+        time.sleep(self.latency)
+        with self._lock:
+            self.rows[worksheet_name] += len(rows)
+
+    def append_row(self, worksheet_name: str, values: list):
+        self.append_rows(worksheet_name, [values])
+
+    def install(self):
+        import sheets
+        sheets.append_rows = self.append_rows
+        sheets.append_row = self.append_row
+
+
+@contextlib.contextmanager
+def shared_runtime():
+    # AppTest 는 run 마다 전역 Runtime 싱글턴을 새로 만들고 끝나면 None 으로 되돌림
+    # → 여러 세션을 동시에 돌리면 서로의 Runtime 을 지워 버림
+    # 실제 서버처럼 모든 세션이 Runtime 하나(미디어/캐시 관리자)를 공유하도록 고정
+    # - 스크립트 컴파일 캐시도 공유: run 마다 새로 컴파일하면 여러 스레드가 동시에 AST 를 만들다
+    #   SystemError("AST constructor recursion depth mismatch") 가 남 (서버는 프로세스당 1회 컴파일)
+    # - AppTest 가 run 마다 켰다 되돌리는 global.appTest 도 미리 켜 둠 (겹치는 run 사이에서 꺼지지 않도록)
+    # 📌 streamlit 내부를 바꾸는 곳은 여기 한 곳: patch.object 라 대상이 없어지면(버전 변경) 바로 AttributeError,
+    #    부하 테스트가 끝나면 모두 원래대로 되돌림
+    from unittest import mock
+
+    from streamlit import config
+    from streamlit.components.v2.component_manager import BidiComponentManager
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import local_script_runner
+
+    runtime = mock.MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    components = BidiComponentManager()
+    components.discover_and_register_components(start_file_watching=False)
+    runtime.bidi_component_registry = components
+    script_cache = ScriptCache()
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.object(Runtime, "instance", classmethod(lambda cls: runtime)))
+        stack.enter_context(mock.patch.object(Runtime, "exists", classmethod(lambda cls: True)))
+        stack.enter_context(mock.patch.object(local_script_runner, "ScriptCache", lambda: script_cache))
+        stack.callback(config.set_option, "global.appTest", config.get_option("global.appTest"))
+        config.set_option("global.appTest", True)
+        yield
+
+
+@contextlib.contextmanager
+def fragment_profiling():
+    # 앱의 rerun 계측(profiling)을 켜서 fragment 단독 rerun 을 셈 (기록 파일은 작업 디렉터리 profiles/)
+    import profiling
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(_setattr(profiling, "ENABLED", True))
+        stack.enter_context(_setattr(profiling, "SAMPLE_RATE", 0.0))
+        yield profiling
+
+
+@contextlib.contextmanager
+def _setattr(obj, name, value):
+    saved = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        setattr(obj, name, saved)
+
+
+def _think(rng: random.Random, think: float):
+    if think > 0:
+        time.sleep(rng.uniform(0, think))
+
+
+# =========================
+# 응답자 시나리오
+# =========================
+def survey_respondent(rec: Recorder, rng: random.Random, timeout: float, think: float):
+    # app.py: cover → consent → survey(27문항) → demographic → result(최종 제출)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(SURVEY_APP, default_timeout=timeout)
+    rec.run(at, "cover")
+    at.button[0].click()
+    rec.run(at, "cover")
+    at.checkbox[0].check()
+    rec.run(at, "consent")
+    at.button[0].click()
+    rec.run(at, "consent")
+
+    for i in range(1, 28):
+        _think(rng, think)
+        # 응답 클릭 → 해당 문항 fragment rerun + on_answer 의 st.rerun(targets) (전체 스크립트는 돌지 않음)
+        at.radio(key=f"q_{i}").set_value(rng.randint(1, 4))
+        rec.run(at, "survey")
+    at.button(key="survey_next_btn").click()
+    rec.run(at, "survey")
+
+    for key, value in DEMOGRAPHIC.items():
+        _think(rng, think)
+        at.radio(key=key).set_value(value)
+        rec.run(at, "demographic")
+    [b for b in at.button if "결과" in b.label][0].click()
+    rec.run(at, "demographic")
+
+    at.text_area(key="survey_feedback").input("부하 테스트")
+    rec.run(at, "result")
+    at.button(key="final_submit").click()
+    rec.run(at, "result")
+    if not at.session_state.saved_to_sheet:
+        raise RuntimeError("final_submit did not save")
+    rec.submitted()
+
+
+def perception_respondent(rec: Recorder, rng: random.Random, timeout: float, think: float):
+    # perception_app.py: 동의 → (single: 전체 form 1회 / paged: 섹션별 다음) → 제출
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(PERCEPTION_APP, default_timeout=timeout)
+    rec.run(at, "consent")
+    at.checkbox[0].check()
+    rec.run(at, "consent")
+
+    for step in range(1, 20):
+        _think(rng, think)
+        for r in at.radio:
+            if r.options and r.value is None:
+                r.set_value(rng.choice(r.options))
+        for sb in at.selectbox:
+            if sb.value is None:
+                sb.set_value(rng.choice(sb.options))
+        for ti in at.text_input:
+            if "근무지" in ti.label:
+                ti.input("○○교도소")
+            elif "휴대전화" in ti.label:
+                ti.input("010-0000-0000")
+        if "perception_section" in at.session_state:
+            page = f"section_{at.session_state.perception_section}"
+        else:
+            page = "form"
+        [b for b in at.button if b.label in ("다음", "설문 제출")][0].click()
+        rec.run(at, page)
+        if at.success:
+            rec.submitted()
+            return
+        # 확인 오류(예: 보상 "예" 선택 후 나타난 휴대전화 번호 칸)는 다음 반복에서 채우고 다시 제출
+    raise RuntimeError(at.error[0].value if at.error else "perception form did not finish")
+
+
+SCENARIOS = {
+    "survey": survey_respondent,
+    "perception": perception_respondent,
+}
+
+
+# =========================
+# 실행 / 집계
+# =========================
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 byte 단위
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _percentiles(samples: list) -> dict:
+    p50, p95, p99 = np.percentile(np.asarray(samples) * 1000, [50, 95, 99])
+    return {"runs": len(samples), "p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "p99_ms": round(p99, 1)}
+
+
+def wait_outbox_drained(limit: float) -> bool:
+    # app.py 는 제출을 outbox 에 넣고 writer 스레드가 시트(stub)로 보냄 → 전송이 끝날 때까지 대기
+    import outbox
+    deadline = time.monotonic() + limit
+    while time.monotonic() < deadline:
+        if not any(s["pending"] for s in outbox.stats().values()):
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def run(scenario: str, users: int, ramp: float = 0.0, think: float = 0.0,
+        sheet_latency: float = 0.3, timeout: float = 60.0, seed: int = 0,
+        drain: float = 30.0) -> dict:
+    stub = SheetStub(sheet_latency)
+    stub.install()
+    rec = Recorder()
+    respondent = SCENARIOS[scenario]
+
+    def one(n):
+        time.sleep(ramp * n / max(users, 1))
+        try:
+            respondent(rec, random.Random(seed + n), timeout, think)
+        except Exception as e:
+            rec.failed(f"{type(e).__name__}: {e}")
+
+    with shared_runtime(), fragment_profiling() as profiling:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=users) as pool:
+            list(pool.map(one, range(users)))
+        wall = time.perf_counter() - started
+        drained = wait_outbox_drained(drain) if scenario == "survey" else None
+        # 서버 쪽 fragment 본문 시간 (전체 rerun 안에서 그려진 것은 제외)
+        fragments = {
+            page[len("fragment:"):]: stats
+            for page, stats in profiling.summary()["pages"].items() if page.startswith("fragment:")
+        }
+    if scenario == "survey" and rec.submits and not fragments.get("survey_q"):
+        rec.failed("keyed fragment rerun (survey_q) was not exercised")
+
+    return {
+        "scenario": scenario,
+        "users": users,
+        "wall_sec": round(wall, 2),
+        "submits": rec.submits,
+        "submits_per_sec": round(rec.submits / wall, 2),
+        "errors": dict(rec.errors),
+        "pages": {page: _percentiles(s) for page, s in rec.latency.items()},
+        "fragment_reruns": fragments,
+        "sheet_rows": dict(stub.rows),
+        "outbox_drained": drained,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def print_report(report: dict):
+    print(f"{report['scenario']}: {report['users']} users, {report['wall_sec']}s")
+    print(f"{'page':<14}{'runs':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for page, p in report["pages"].items():
+        print(f"{page:<14}{p['runs']:>7}{p['p50_ms']:>10}{p['p95_ms']:>10}{p['p99_ms']:>10}")
+    if report["fragment_reruns"]:
+        print(f"{'fragment':<24}{'runs':>7}{'mean ms':>10}{'p95 ms':>10}  (서버 쪽 fragment 본문)")
+        for name, f in report["fragment_reruns"].items():
+            print(f"{name:<24}{f['count']:>7}{f['mean_ms']:>10}{f['p95_ms']:>10}")
+    print(f"submits: {report['submits']} ({report['submits_per_sec']}/s)")
+    print(f"peak RSS: {report['peak_rss_mb']} MB")
+    if report["outbox_drained"] is not None:
+        drained = "" if report["outbox_drained"] else " (outbox not drained)"
+        print(f"sheet stub rows: {report['sheet_rows']}{drained}")
+    for error, n in report["errors"].items():
+        print(f"error x{n}: {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="설문 앱 동시 응답자 부하 테스트")
+    parser.add_argument("scenario", choices=list(SCENARIOS))
+    parser.add_argument("--users", type=int, default=10, help="동시 응답자 수")
+    parser.add_argument("--ramp", type=float, default=0.0, help="응답자 시작을 나눠 두는 시간(초)")
+    parser.add_argument("--think", type=float, default=0.0, help="조작 사이 최대 대기(초, 0~think 균등)")
+    parser.add_argument("--sheet-latency", type=float, default=0.3, help="Sheets stub 호출당 지연(초)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="rerun 1회 제한 시간(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--drain", type=float, default=30.0, help="종료 후 outbox 전송 대기 한도(초)")
+    parser.add_argument("--workdir", default=None, help="outbox/CSV 등을 쓸 디렉터리 (기본: 임시 디렉터리)")
+    parser.add_argument("--json", default=None, help="결과를 JSON 파일로도 저장")
+    args = parser.parse_args(argv)
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    # 앱이 만드는 파일(outbox, 응답 CSV, 컬럼형 저장소)은 작업 디렉터리에만 기록
+    workdir = args.workdir or tempfile.mkdtemp(prefix="loadtest-")
+    os.makedirs(workdir, exist_ok=True)
+    os.environ["SURVEY_OUTBOX_PATH"] = os.path.join(workdir, "outbox.sqlite3")
+    os.environ["PERCEPTION_STORE_ROOT"] = os.path.join(workdir, "perception_store")
+    os.chdir(workdir)
+    sys.path.insert(0, HERE)
+
+    # 세션마다 반복되는 경고(빈 label, ScriptRunContext 없음 등)는 숨김
+    from streamlit import config
+    from streamlit.logger import set_log_level
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+
+    report = run(args.scenario, args.users, args.ramp, args.think,
+                 args.sheet_latency, args.timeout, args.seed, args.drain)
+    report["workdir"] = workdir
+    print_report(report)
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
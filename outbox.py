@@ -0,0 +1,307 @@
+import argparse
+import json
+import os
+import random
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+import analytics
+import reliability
+import sheets
+
+# =========================
+# 로컬 outbox (SQLite WAL, append-only)
+# - 모든 제출은 먼저 로컬 디스크에 커밋 → 이후 replay 가 워크시트로 전송
+# - 전송 실패(429, 네트워크, 인증 만료 등) 시 지수 백오프로 재시도
+# - 행은 삭제하지 않고 sent_at 으로 전송 여부만 기록
+# - 단, 개인정보(전화번호)·자유 의견 행은 전송 완료 즉시 payload 를 시각만 남기고 지움 (REDACT_WORKSHEETS)
+# - 같은 DB 에 관리자 화면용 누적 집계(analytics)와 신뢰도 상태(reliability)도 함께 보관
+#   전송 완료 기록(mark_sent)과 같은 트랜잭션에서 갱신 → 시트에 저장된 응답만 반영
+# =========================
+OUTBOX_PATH = os.environ.get("SURVEY_OUTBOX_PATH", "outbox.sqlite3")
+
+CLAIM_LEASE = 60.0      # 전송 중인 행을 다른 워커가 다시 가져가지 않도록 잡아두는 시간(초)
+BACKOFF_BASE = 2.0      # 첫 재시도 대기(초)
+BACKOFF_MAX = 300.0     # 최대 재시도 대기(초)
+
+# 전송 후 로컬에 내용을 남기지 않는 워크시트 (동의 안내: 번호는 분리 저장, 발송 후 삭제)
+REDACT_WORKSHEETS = ("phone", "feedback")
+_REDACT = "payload = json_array(json_extract(payload, '$[0]'))"  # [time, 값] → [time]
+
+PENDING = "pending"     # 아직 전송 전
+RETRYING = "retrying"   # 전송 실패, 재시도 대기 중 (로컬에는 안전하게 보관됨)
+SAVED = "saved"         # 워크시트 전송 완료
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    submission_id TEXT NOT NULL,
+    worksheet TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    sent_at REAL,
+    last_error TEXT,
+    leased_until REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (sent_at, next_attempt_at);
+CREATE INDEX IF NOT EXISTS outbox_submission ON outbox (submission_id);
+"""
+
+_initialized = set()
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    path = path or OUTBOX_PATH
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=FULL")
+    conn.execute("PRAGMA secure_delete=ON")  # 지운 payload 가 빈 페이지에 남지 않도록
+    if path not in _initialized:
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(outbox)")}
+        if "leased_until" not in columns:  # 이전 버전 DB
+            conn.execute("ALTER TABLE outbox ADD COLUMN leased_until REAL")
+        redact_sent(conn)  # 이전 버전에서 전송만 되고 남아 있던 행 정리
+        analytics.init(conn)
+        reliability.init(conn)
+        _initialized.add(path)
+    return conn
+
+
+def backoff_delay(attempts: int) -> float:
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** max(attempts - 1, 0)))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def enqueue(submission_id: str, items: list, path: str = None):
+    # items: [(worksheet 이름, 행 값 리스트), ...] → 한 트랜잭션으로 커밋
+    now = time.time()
+    with closing(connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            "INSERT INTO outbox (submission_id, worksheet, payload, created_at, next_attempt_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(submission_id, ws, json.dumps(values, ensure_ascii=False), now, now)
+             for ws, values in items],
+        )
+        conn.execute("COMMIT")
+
+
+def status(submission_id: str, path: str = None) -> dict:
+    with closing(connect(path)) as conn:
+        rows = conn.execute(
+            "SELECT worksheet, sent_at, attempts, last_error FROM outbox WHERE submission_id = ?",
+            (submission_id,),
+        ).fetchall()
+    out = {}
+    for ws, sent_at, attempts, last_error in rows:
+        if sent_at is not None:
+            out[ws] = (SAVED, "")
+        elif attempts > 0:
+            out[ws] = (RETRYING, last_error or "")
+        else:
+            out[ws] = (PENDING, "")
+    return out
+
+
+def claim_due(limit: int, path: str = None) -> list:
+    # 전송할 행을 가져오면서 lease 를 걸어 다른 프로세스의 중복 전송을 막는다
+    # - lease 는 next_attempt_at 과 별도 컬럼 → retry 로 재시도 시각을 당겨도 전송 중인 행은 그대로
+    now = time.time()
+    with closing(connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            "SELECT id, worksheet, payload, attempts FROM outbox "
+            "WHERE sent_at IS NULL AND next_attempt_at <= ? "
+            "AND (leased_until IS NULL OR leased_until <= ?) ORDER BY id LIMIT ?",
+            (now, now, limit),
+        ).fetchall()
+        conn.executemany(
+            "UPDATE outbox SET leased_until = ? WHERE id = ?",
+            [(now + CLAIM_LEASE, row[0]) for row in rows],
+        )
+        conn.execute("COMMIT")
+    return rows
+
+
+def _marks(values) -> str:
+    return ", ".join("?" for _ in values)
+
+
+def mark_sent(ids: list, path: str = None):
+    now = time.time()
+    with closing(connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        # 이번에 처음 저장된 행만 집계 (lease 만료로 두 워커가 같은 행을 보낸 경우에도 한 번만)
+        newly = conn.execute(
+            f"SELECT worksheet, payload FROM outbox WHERE sent_at IS NULL AND id IN ({_marks(ids)})", ids
+        ).fetchall()
+        items = [(ws, json.loads(payload)) for ws, payload in newly]
+        analytics.apply(conn, items)
+        reliability.apply(conn, items)
+        conn.executemany(
+            "UPDATE outbox SET sent_at = ?, attempts = attempts + 1, last_error = NULL, leased_until = NULL "
+            "WHERE id = ? AND sent_at IS NULL",
+            [(now, i) for i in ids],
+        )
+        conn.executemany(
+            f"UPDATE outbox SET {_REDACT} WHERE id = ? AND worksheet IN ({_marks(REDACT_WORKSHEETS)})",
+            [(i, *REDACT_WORKSHEETS) for i in ids],
+        )
+        conn.execute("COMMIT")
+
+
+def redact_sent(conn) -> int:
+    # 전송 완료된 전화번호/의견 행의 내용 삭제 (이미 지운 행은 그대로)
+    cur = conn.execute(
+        f"UPDATE outbox SET {_REDACT} WHERE sent_at IS NOT NULL "
+        f"AND worksheet IN ({_marks(REDACT_WORKSHEETS)}) AND json_array_length(payload) > 1",
+        REDACT_WORKSHEETS,
+    )
+    return cur.rowcount
+
+
+def mark_failed(rows: list, error: str, path: str = None):
+    # rows: claim_due 가 돌려준 (id, worksheet, payload, attempts)
+    now = time.time()
+    with closing(connect(path)) as conn:
+        conn.executemany(
+            "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?, leased_until = NULL "
+            "WHERE id = ?",
+            [(attempts + 1, now + backoff_delay(attempts + 1), error[:500], row_id)
+             for row_id, _, _, attempts in rows],
+        )
+
+
+def next_due_in(path: str = None):
+    # 다음 전송 예정까지 남은 시간(초), 대기 행이 없으면 None
+    with closing(connect(path)) as conn:
+        (due,) = conn.execute(
+            "SELECT MIN(MAX(next_attempt_at, COALESCE(leased_until, 0))) FROM outbox WHERE sent_at IS NULL"
+        ).fetchone()
+    if due is None:
+        return None
+    return max(0.0, due - time.time())
+
+
+def replay_once(limit: int = 200, path: str = None) -> int:
+    # 만기된 행을 워크시트별로 모아 append_rows 1회씩 전송, 전송한 행 수 반환
+    rows = claim_due(limit, path)
+    by_sheet = OrderedDict()
+    for row in rows:
+        by_sheet.setdefault(row[1], []).append(row)
+
+    sent = 0
+    for ws, ws_rows in by_sheet.items():
+        try:
+            sheets.append_rows(ws, [json.loads(row[2]) for row in ws_rows])
+        except Exception as e:
+            mark_failed(ws_rows, str(e), path)
+        else:
+            mark_sent([row[0] for row in ws_rows], path)
+            sent += len(ws_rows)
+    return sent
+
+
+def stats(path: str = None) -> dict:
+    now = time.time()
+    with closing(connect(path)) as conn:
+        rows = conn.execute(
+            "SELECT worksheet, "
+            "SUM(sent_at IS NOT NULL), SUM(sent_at IS NULL), "
+            "SUM(sent_at IS NULL AND attempts > 0), MIN(CASE WHEN sent_at IS NULL THEN created_at END) "
+            "FROM outbox GROUP BY worksheet ORDER BY worksheet"
+        ).fetchall()
+    out = {}
+    for ws, sent, pending, retrying, oldest in rows:
+        out[ws] = {
+            "sent": sent,
+            "pending": pending,
+            "retrying": retrying,
+            "oldest_pending_sec": round(now - oldest, 1) if oldest is not None else None,
+        }
+    return out
+
+
+# =========================
+# CLI: python outbox.py {stats,list,retry,drain,redact}
+# =========================
+def _cmd_stats(args):
+    print(json.dumps(stats(args.path), ensure_ascii=False, indent=2))
+
+
+def _cmd_list(args):
+    query = "SELECT id, submission_id, worksheet, created_at, attempts, last_error FROM outbox"
+    if not args.all:
+        query += " WHERE sent_at IS NULL"
+    query += " ORDER BY id LIMIT ?"
+    with closing(connect(args.path)) as conn:
+        for row_id, sid, ws, created_at, attempts, last_error in conn.execute(query, (args.limit,)):
+            created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created_at))
+            print(f"{row_id}\t{sid}\t{ws}\t{created}\tattempts={attempts}\t{last_error or ''}")
+
+
+def _cmd_retry(args):
+    # 백오프 대기 중인 행을 즉시 재시도 대상으로 (다른 워커가 전송 중인 행은 제외)
+    now = time.time()
+    with closing(connect(args.path)) as conn:
+        cur = conn.execute(
+            "UPDATE outbox SET next_attempt_at = ? WHERE sent_at IS NULL AND next_attempt_at > ? "
+            "AND (leased_until IS NULL OR leased_until <= ?)",
+            (now, now, now),
+        )
+    print(f"{cur.rowcount} rows scheduled for retry")
+
+
+def _cmd_redact(args):
+    with closing(connect(args.path)) as conn:
+        n = redact_sent(conn)
+    print(f"{n} sent rows redacted ({', '.join(REDACT_WORKSHEETS)})")
+
+
+def _cmd_drain(args):
+    deadline = time.monotonic() + args.max_seconds
+    total = 0
+    while time.monotonic() < deadline:
+        sent = replay_once(limit=args.batch, path=args.path)
+        total += sent
+        wait = next_due_in(args.path)
+        if wait is None:
+            break
+        if sent == 0:
+            time.sleep(min(wait, max(0.0, deadline - time.monotonic()), 5.0))
+    print(f"sent {total} rows")
+    _cmd_stats(args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="설문 응답 로컬 outbox 점검/전송")
+    parser.add_argument("--path", default=OUTBOX_PATH, help="outbox SQLite 파일 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("stats", help="워크시트별 전송/대기 건수").set_defaults(func=_cmd_stats)
+
+    p = sub.add_parser("list", help="대기 중인 행 목록")
+    p.add_argument("--all", action="store_true", help="전송 완료 행 포함")
+    p.add_argument("--limit", type=int, default=50)
+    p.set_defaults(func=_cmd_list)
+
+    sub.add_parser("retry", help="백오프 대기 중인 행을 즉시 재시도").set_defaults(func=_cmd_retry)
+
+    p = sub.add_parser("drain", help="대기 행을 워크시트로 전송")
+    p.add_argument("--batch", type=int, default=200)
+    p.add_argument("--max-seconds", type=float, default=300.0)
+    p.set_defaults(func=_cmd_drain)
+
+    sub.add_parser("redact", help="전송 완료된 전화번호/의견 행의 내용 삭제").set_defaults(func=_cmd_redact)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
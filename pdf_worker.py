@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import result_pdf
+
+# =========================
+# 결과지 PDF 백그라운드 생성
+# - 결과 화면에 들어오면 request(result) 로 작업 스레드에 생성을 맡기고 화면은 바로 그림
+# - 키: result dict 내용의 해시 → 같은 결과는 rerun·재다운로드와 무관하게 한 번만 생성
+# - 완성된 PDF 는 개수 제한 LRU 에 보관, 상태는 키로 조회 (결과 화면에서 주기적으로 확인)
+# - reportlab TTFont 는 여러 문서를 동시에 만들지 않는 것을 전제로 하고,
+#   생성은 CPU 작업(GIL)이라 스레드를 늘려도 빨라지지 않음 → 작업 스레드 1개
+#   (렌더러 예열 warm_up 도 같은 작업 스레드에서 → 결과지 생성과 겹치지 않음)
+# =========================
+PDF_CACHE_SIZE = int(os.environ.get("PDF_CACHE_SIZE", "256"))  # 보관할 PDF 개수 (건당 약 40KB)
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+def result_key(result: dict) -> str:
+    payload = json.dumps(result, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PdfCache:
+    def __init__(self, max_items: int = PDF_CACHE_SIZE):
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._ready = OrderedDict()  # key -> PDF 바이트 (오래 안 쓴 것부터 제거)
+        self._jobs = {}              # key -> Future (생성 중/실패)
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-pdf")
+
+    def request(self, result: dict) -> str:
+        key = result_key(result)
+        with self._lock:
+            if key in self._ready:
+                self._ready.move_to_end(key)
+            else:
+                job = self._jobs.get(key)
+                if job is None or (job.done() and job.exception() is not None):
+                    # 처음 요청이거나 이전 생성이 실패한 경우에만 새로 생성
+                    self._jobs[key] = self._pool.submit(self._render, key, dict(result))
+        return key
+
+    def warm_up(self):
+        return self._pool.submit(result_pdf.warm_up)
+
+    def _render(self, key: str, result: dict):
+        # 실패하면 예외가 Future 에 남음 → poll 에서 오류 표시, 다음 request 때 재시도
+        data = result_pdf.make_result_pdf(result)
+        with self._lock:
+            self._ready[key] = data
+            self._ready.move_to_end(key)
+            while len(self._ready) > self.max_items:
+                self._ready.popitem(last=False)
+            self._jobs.pop(key, None)
+
+    def poll(self, key: str) -> tuple:
+        # -> (READY, PDF 바이트) | (PENDING, None) | (FAILED, 오류 메시지)
+        with self._lock:
+            if key in self._ready:
+                return READY, self._ready[key]
+            future = self._jobs.get(key)
+        if future is None or not future.done():
+            return PENDING, None
+        error = future.exception()
+        if error is not None:
+            return FAILED, f"{type(error).__name__}: {error}"
+        return PENDING, None
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "ready": len(self._ready),
+                "ready_kb": round(sum(len(b) for b in self._ready.values()) / 1024, 1),
+                "jobs": len(self._jobs),
+            }
+
+
+_cache = PdfCache()
+
+
+def request(result: dict) -> str:
+    return _cache.request(result)
+
+
+def warm_up():
+    return _cache.warm_up()
+
+
+def poll(key: str) -> tuple:
+    return _cache.poll(key)
+
+
+def info() -> dict:
+    return _cache.info()
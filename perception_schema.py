@@ -0,0 +1,188 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# =========================
+# perception_app 응답 컬럼 구성
+# - 문항 수와 컬럼 이름 규칙을 한 곳에서 관리 (CSV / 컬럼형 저장 / 분석 공통)
+# =========================
+ATT_N = 38      # Ⅰ. 태도 (정신문제 / 일반 수용자 각각)
+REL_N = 7       # Ⅱ-1. 관계 형용사 쌍 (정신문제 / 일반 수용자 각각)
+MED_N = 5       # Ⅱ-4. 의료과·심리치료과(팀)과의 상호관계
+BO_N = 22       # Ⅲ. 직무소진 (K-BAT)
+PERCEP_N = 18   # Ⅳ. 인식 형용사 (4집단)
+EDU_N = 5       # Ⅴ-2. 교육·훈련 필요성
+
+PERCEP_TARGETS = ["MENTAL", "GENERAL", "MENTAL_GEN", "GENERAL_GEN"]
+
+# 공통 척도 정의 (화면 표시 값)
+# - 위젯 값은 정수 코드(1~n), 보기 문구는 그릴 때만 붙임 (scale_label) → 저장 시 문자열 파싱 없음
+LIKERT5 = [
+    "1 - 매우 부동의",
+    "2 - 부동의",
+    "3 - 중립",
+    "4 - 동의",
+    "5 - 매우 동의",
+]
+
+SDIFF_7 = ["1", "2", "3", "4", "5", "6", "7"]
+
+FREQ3 = [
+    "1 - 항상 그렇다",
+    "2 - 가끔 그렇다",
+    "3 - 전혀 아니다",
+]
+
+YESNO3 = [
+    "1 - 거의 없다",
+    "2 - 가끔 있다",
+    "3 - 매우 자주 있다",
+]
+
+def scale_codes(labels):
+    return list(range(1, len(labels) + 1))
+
+def scale_label(labels, code):
+    # 1 -> "1 - 매우 부동의"
+    return labels[code - 1]
+
+
+# 화면 표시 문자열 → 숫자 (위젯이 표시 문자열을 값으로 갖던 이전 방식)
+# - 앱은 정수 코드를 그대로 저장하므로 쓰지 않음, 이전 형식 값 변환과 bench.py 비교용으로 유지
+def likert5_to_num(v):
+    # "1 - 매우 부동의" -> 1
+    if v and isinstance(v, str) and v[0].isdigit():
+        return int(v.split(" ")[0])
+    return None
+
+def freq3_to_num(v):
+    # "1 - 항상 그렇다" -> 1
+    if v and isinstance(v, str) and v[0].isdigit():
+        return int(v.split(" ")[0])
+    return None
+
+def yesno3_to_num(v):
+    # "1 - 거의 없다" -> 1
+    if v and isinstance(v, str) and v[0].isdigit():
+        return int(v.split(" ")[0])
+    return None
+
+def sdiff7_to_num(v):
+    # "1"~"7" -> 1~7
+    if v and isinstance(v, str) and v.isdigit():
+        return int(v)
+    return None
+
+
+# 선택형 인구학/관계 문항 보기 (저장 시 사전(dictionary) 인코딩)
+GENDER_OPTIONS = ["남", "여", "응답하지 않음"]
+DIFFICULTY_OPTIONS = ["매우 낮음", "낮음", "보통", "높음", "매우 높음"]
+FREQ_MENTAL_OPTIONS = [
+    "거의 대면하지 않았다",
+    "가끔 대면했다",
+    "자주 대면했다",
+    "매우 자주 대면했다",
+]
+FAMILY_VIEW_OPTIONS = [
+    "매우 기쁘며 긍정적임",
+    "대체로 긍정적임",
+    "중립적임",
+    "부정적이거나 걱정이 많음",
+]
+REWARD_OPTIONS = ["아니요", "예"]
+REWARD_YES = REWARD_OPTIONS.index("예")
+
+EDU_EXPERIENCE_OPTIONS = [
+    "업무관련 정신질환 교육(직무교육)",
+    "업무와 무관한 정신질환 교육(예: 대학교 강의나 외부 강의)",
+    "인권(감수성) 교육",
+    "기타 교육",
+    "없음",
+]
+
+# 선택형 문항 코드 = 보기 목록 안의 순서 (0부터, columnar_store 사전 인코딩과 같은 값)
+CATEGORIES = {
+    "gender": GENDER_OPTIONS,
+    "difficulty": DIFFICULTY_OPTIONS,
+    "freq_mental": FREQ_MENTAL_OPTIONS,
+    "family_view": FAMILY_VIEW_OPTIONS,
+    "want_reward": REWARD_OPTIONS,
+}
+
+# 컬럼 그룹: 분석 시 필요한 그룹만 골라서 읽기 위함
+COLUMN_GROUPS = OrderedDict([
+    ("META", ["timestamp", "gender", "age", "org", "dept", "difficulty", "years",
+              "freq_mental", "family_view", "edu_experience", "want_reward"]),
+    ("TEXT", ["barrier", "improve", "rights_need"]),
+    ("CONTACT", ["phone_number"]),
+    ("SUPPORT", ["peer_support_1", "peer_support_2", "family_safety"]),
+    ("ATT", [f"ATT_{i:02d}_{t}" for i in range(1, ATT_N + 1) for t in ["MENTAL", "GENERAL"]]),
+    ("REL", [f"REL_{t}_{i:02d}" for i in range(1, REL_N + 1) for t in ["M", "G"]]),
+    ("MED", [f"MED_{i:02d}" for i in range(1, MED_N + 1)]),
+    ("BO", [f"BO_{i:02d}" for i in range(1, BO_N + 1)]),
+    ("P", [f"P_{t}_{i:02d}" for i in range(1, PERCEP_N + 1) for t in PERCEP_TARGETS]),
+    ("EDU", [f"EDU_{i:02d}" for i in range(1, EDU_N + 1)]),
+])
+
+# 숫자 척도 문항 (1~7 범위 → int8)
+ITEM_GROUPS = ["SUPPORT", "ATT", "REL", "MED", "BO", "P", "EDU"]
+ITEM_COLUMNS = [c for g in ITEM_GROUPS for c in COLUMN_GROUPS[g]]
+ALL_COLUMNS = [c for cols in COLUMN_GROUPS.values() for c in cols]
+
+
+# =========================
+# 세션 응답 레코드 (고정 배치 int8 배열)
+# - 척도 문항 / 선택형 문항 / 연령·근무 연수 / 교육 경험(보기별 비트) → 슬롯 1개씩
+# - 자유 응답(근무지·부서·서술형·전화번호)만 dict 로 따로 보관
+# - 세션마다 문자열 수백 개 대신 int8 배열 하나 → 설문을 열어 둔 세션이 많아도 메모리 일정
+# =========================
+MISSING = -1
+CODED_COLUMNS = ITEM_COLUMNS + list(CATEGORIES) + ["age", "years", "edu_experience"]
+SLOT = {c: i for i, c in enumerate(CODED_COLUMNS)}
+N_SLOTS = len(CODED_COLUMNS)
+
+
+class AnswerRecord:
+    __slots__ = ("codes", "text")
+
+    def __init__(self):
+        self.codes = np.full(N_SLOTS, MISSING, dtype=np.int8)
+        self.text = {}
+
+    def get(self, col, default=None):
+        # 섹션 렌더링의 saved.get(...) 과 같은 방식으로 사용 (미응답이면 default)
+        i = SLOT.get(col)
+        if i is None:
+            return self.text.get(col, default)
+        v = int(self.codes[i])
+        if v == MISSING:
+            return default
+        if col == "edu_experience":
+            return [k for k in range(len(EDU_EXPERIENCE_OPTIONS)) if v >> k & 1]
+        return v
+
+    def update(self, values: dict):
+        # 섹션 렌더링 결과 {저장 컬럼명: 위젯 값} 반영
+        for col, v in values.items():
+            i = SLOT.get(col)
+            if i is None:
+                self.text[col] = v
+            elif v is None:
+                self.codes[i] = MISSING
+            elif col == "edu_experience":
+                self.codes[i] = sum(1 << k for k in v)
+            else:
+                self.codes[i] = v
+
+    def label(self, col):
+        # 선택형 문항 코드 → 보기 문구 (저장 형식은 기존과 같은 문자열)
+        code = self.get(col)
+        return None if code is None else CATEGORIES[col][code]
+
+    def item_values(self) -> dict:
+        # 척도 문항 전체 {컬럼: 정수 코드 또는 None} → 제출 시 배열 슬라이스 한 번으로 변환
+        codes = self.codes[:len(ITEM_COLUMNS)].tolist()
+        return dict(zip(ITEM_COLUMNS, [None if v == MISSING else v for v in codes]))
+
+    def edu_labels(self):
+        return [EDU_EXPERIENCE_OPTIONS[k] for k in self.get("edu_experience") or []]
@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+# =========================
+# rerun 계측 (선택 사용)
+# - 켜는 방법: 환경변수 SURVEY_PROFILE=1 (전체) 또는 ?profile=<SURVEY_PROFILE_TOKEN> (관리자 세션만)
+# - 페이지(cover/consent/survey/demographic/result)별, 구간(phase)별 벽시계 시간 기록
+# - SURVEY_PROFILE_SAMPLE 비율만큼의 rerun 은 스택 샘플링 → folded 형식(flamegraph.pl, speedscope 호환)
+# - with rerun(...) 로 스크립트 본문을, with fragment(...) 로 fragment 본문을 감쌈
+#   → st.stop()/st.rerun() 예외로 끝나도 종료 시각이 정확히 기록됨 (샘플링하지 않는 rerun 은 스레드 없음)
+# - fragment 단독 rerun(st.rerun(targets), run_every)은 page "fragment:<이름>" 으로 기록
+#   (전체 rerun 안에서 그려질 때는 그 rerun 에 포함)
+# - 요약: 관리자 화면(현재 서버 프로세스) / python profiling.py summary (reruns.jsonl, 전체 프로세스)
+# =========================
+ENABLED = os.environ.get("SURVEY_PROFILE", "").lower() in ("1", "true", "yes")
+TOKEN = os.environ.get("SURVEY_PROFILE_TOKEN", "")
+SAMPLE_RATE = float(os.environ.get("SURVEY_PROFILE_SAMPLE", "0"))
+SAMPLE_INTERVAL = float(os.environ.get("SURVEY_PROFILE_INTERVAL", "0.005"))  # 초
+OUTPUT_DIR = os.environ.get("SURVEY_PROFILE_DIR", "profiles")
+
+HISTORY = 500           # 구간별 최근 기록 보관 개수
+
+_lock = threading.Lock()
+_phase_times = defaultdict(lambda: deque(maxlen=HISTORY))  # (page, phase) -> [초]
+_page_times = defaultdict(lambda: deque(maxlen=HISTORY))   # page -> [초]
+_active = threading.local()  # 이 스레드에서 진행 중인 Rerun (fragment 중첩 판단)
+
+
+class _NullRerun:
+    page = None
+
+    def phase(self, name: str):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullRerun()
+
+
+class Rerun:
+    def __init__(self, page: str = None, sampled: bool = False):
+        self.page = page
+        self.sampled = sampled
+        self._thread_id = threading.get_ident()
+        self._phases = []  # [(이름, 시작 시각)]
+        self._stacks = Counter()
+        self._done = threading.Event()
+        self._sampler = None
+
+    def phase(self, name: str):
+        # 새 구간 시작 = 이전 구간 종료
+        self._phases.append((name, time.perf_counter()))
+
+    def __enter__(self):
+        _active.rerun = self
+        self._started = time.perf_counter()
+        if self.sampled:
+            self._sampler = threading.Thread(target=self._sample, name="rerun-profiler", daemon=True)
+            self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        # 정상 종료 / st.stop() / st.rerun() / 오류 모두 여기로
+        ended = time.perf_counter()
+        _active.rerun = None
+        if self._sampler is not None:
+            self._done.set()
+            self._sampler.join()
+        self._finish(ended)
+        return False
+
+    def _sample(self):
+        while not self._done.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self._stacks[_fold(frame)] += 1
+
+    def _finish(self, ended: float):
+        page = self.page or "unknown"
+        spans = []
+        for k, (name, start) in enumerate(self._phases):
+            end = self._phases[k + 1][1] if k + 1 < len(self._phases) else ended
+            spans.append((name, end - start))
+        total = ended - self._started
+
+        with _lock:
+            _page_times[page].append(total)
+            for name, sec in spans:
+                _phase_times[(page, name)].append(sec)
+
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        record = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "page": page,
+            "total_ms": round(total * 1000, 2),
+            "phases_ms": {name: round(sec * 1000, 2) for name, sec in spans},
+        }
+        with open(os.path.join(OUTPUT_DIR, "reruns.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        if self._stacks:
+            path = os.path.join(OUTPUT_DIR, f"rerun-{page.replace(':', '-')}-{time.time_ns()}.folded")
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in self._stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+
+def _fold(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        name = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+        if code.co_name == "<module>":
+            name += f":{frame.f_lineno}"  # 스크립트 최상위 코드는 줄 번호로 구분
+        parts.append(name)
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def _enabled(query_params) -> bool:
+    if ENABLED:
+        return True
+    return bool(TOKEN) and query_params is not None and query_params.get("profile") == TOKEN
+
+
+def _sampled() -> bool:
+    return SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE
+
+
+def rerun(query_params=None):
+    # 스크립트 본문 전체를 감쌈: with profiling.rerun(st.query_params) as _prof:
+    if not _enabled(query_params):
+        return _NULL
+    return Rerun(sampled=_sampled())
+
+
+def fragment(name: str, query_params=None):
+    # fragment 본문을 감쌈. 전체 rerun 안에서 불리면 아무것도 하지 않음 (바깥 rerun 구간에 포함)
+    if getattr(_active, "rerun", None) is not None or not _enabled(query_params):
+        return _NULL
+    return Rerun(page=f"fragment:{name}", sampled=_sampled())
+
+
+def _stats(samples) -> dict:
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2),
+    }
+
+
+def summary() -> dict:
+    # 이 프로세스의 최근 기록 → {"pages": {page: {...}}, "phases": {"page/phase": {...}}} (단위: ms)
+    with _lock:
+        pages = {p: _stats(v) for p, v in _page_times.items() if v}
+        phases = {f"{p}/{n}": _stats(v) for (p, n), v in _phase_times.items() if v}
+    return {"pages": pages, "phases": phases}
+
+
+def summary_log(path: str = None) -> dict:
+    # reruns.jsonl 전체(여러 프로세스·재시작 포함) → summary() 와 같은 모양
+    pages, phases = defaultdict(list), defaultdict(list)
+    with open(path or os.path.join(OUTPUT_DIR, "reruns.jsonl"), encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            pages[record["page"]].append(record["total_ms"] / 1000)
+            for name, ms in record["phases_ms"].items():
+                phases[f"{record['page']}/{name}"].append(ms / 1000)
+    return {
+        "pages": {p: _stats(v) for p, v in pages.items()},
+        "phases": {k: _stats(v) for k, v in phases.items()},
+    }
+
+
+# =========================
+# CLI: python profiling.py summary [--log 경로] [--json]
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="rerun 계측 기록 요약")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("summary", help="화면별/구간별 소요시간 (평균, p95, 최대)")
+    p.add_argument("--log", default=None, help=f"reruns.jsonl 경로 (기본: {OUTPUT_DIR}/reruns.jsonl)")
+    p.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    args = parser.parse_args(argv)
+
+    out = summary_log(args.log)
+    if args.json:
+        print(json.dumps(out, ensure_ascii=False, indent=2))
+        return
+    for title, rows in (("page", out["pages"]), ("page/phase", out["phases"])):
+        print(f"{title:<36}{'count':>8}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}")
+        for name, v in sorted(rows.items()):
+            print(f"{name:<36}{v['count']:>8}{v['mean_ms']:>10}{v['p95_ms']:>10}{v['max_ms']:>10}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
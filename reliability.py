@@ -0,0 +1,239 @@
+import argparse
+import json
+from contextlib import closing
+
+import numpy as np
+
+import responses
+import scoring
+
+# =========================
+# 척도 신뢰도 실시간 추적 (Cronbach's α, 문항 제거 시 α, 수정된 문항-총점 상관)
+# - 27문항 평균 벡터와 편차 곱 합(M2, 27x27)을 Welford 방식으로 누적 → 제출 1건당 O(27²)
+# - 상태는 outbox DB 에 보관, sheet1 행이 워크시트에 저장된 것으로 기록하는 같은 트랜잭션에서 갱신
+#   (outbox.mark_sent, analytics 와 같은 기준 → 관리자 화면의 응답 수와 α 의 표본이 같음)
+# - 하위척도 통계는 공분산 행렬의 부분 행렬만으로 계산 → 조회 시 원자료 불필요
+# 예) python reliability.py show                 (outbox 누적 상태)
+#     python reliability.py show responses.csv   (저장된 응답에서 바로 계산)
+# =========================
+N_ITEMS = scoring.N_ITEMS
+SUBSCALES = {
+    "감": list(range(0, 9)),
+    "수": list(range(9, 18)),
+    "성": list(range(18, 27)),
+    "정신질환": [i - 1 for i in scoring.MH_ITEMS],
+}
+
+# reliability_sent: 전송 완료 기준 상태 (이전 reliability_state 는 outbox 커밋 기준 → 지우고 다시 계산)
+SCHEMA = """
+DROP TABLE IF EXISTS reliability_state;
+CREATE TABLE IF NOT EXISTS reliability_sent (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    n INTEGER NOT NULL,
+    mean BLOB NOT NULL,
+    m2 BLOB NOT NULL
+);
+"""
+
+
+class RunningCovariance:
+    def __init__(self, k: int = N_ITEMS):
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros((k, k))  # 편차 곱의 합: cov = m2 / (n - 1)
+
+    def update(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += np.outer(delta, x - self.mean)
+
+    def merge(self, other: "RunningCovariance"):
+        # 두 묶음의 통계를 합침 (Chan et al. 병렬 공식) → 일괄 적재·재계산용
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + np.outer(delta, delta) * (self.n * other.n / n)
+        self.mean += delta * (other.n / n)
+        self.n = n
+
+    @classmethod
+    def from_matrix(cls, answers) -> "RunningCovariance":
+        x = np.asarray(answers, dtype=np.float64)
+        rc = cls(x.shape[1] if x.ndim == 2 else N_ITEMS)
+        if len(x):
+            rc.n = len(x)
+            rc.mean = x.mean(axis=0)
+            centered = x - rc.mean
+            rc.m2 = centered.T @ centered
+        return rc
+
+    def cov(self) -> np.ndarray:
+        if self.n < 2:
+            return np.full_like(self.m2, np.nan)
+        return self.m2 / (self.n - 1)
+
+    def to_row(self) -> tuple:
+        return self.n, self.mean.tobytes(), self.m2.tobytes()
+
+    @classmethod
+    def from_row(cls, n: int, mean: bytes, m2: bytes) -> "RunningCovariance":
+        rc = cls()
+        rc.n = n
+        rc.mean = np.frombuffer(mean, dtype=np.float64).copy()
+        rc.m2 = np.frombuffer(m2, dtype=np.float64).reshape(N_ITEMS, N_ITEMS).copy()
+        return rc
+
+
+# =========================
+# 신뢰도 통계 (공분산 행렬 → 하위척도별)
+# =========================
+def cronbach_alpha(c: np.ndarray) -> float:
+    k = c.shape[0]
+    total_var = c.sum()
+    if k < 2 or not total_var > 0:
+        return float("nan")
+    return k / (k - 1) * (1 - np.trace(c) / total_var)
+
+
+def subscale_stats(rc: RunningCovariance, items: list) -> dict:
+    c = rc.cov()[np.ix_(items, items)]
+    total_var = c.sum()
+    row_sums = c.sum(axis=1)
+    diag = np.diag(c)
+
+    # 수정된 문항-총점 상관: 문항 i 와 (나머지 문항 합)의 상관
+    rest_cov = row_sums - diag
+    rest_var = total_var - 2 * row_sums + diag
+    with np.errstate(invalid="ignore", divide="ignore"):
+        item_total_r = rest_cov / np.sqrt(diag * rest_var)
+
+    alpha_if_deleted = []
+    for j in range(len(items)):
+        keep = [m for m in range(len(items)) if m != j]
+        alpha_if_deleted.append(cronbach_alpha(c[np.ix_(keep, keep)]))
+
+    return {
+        "n": rc.n,
+        "alpha": _round(cronbach_alpha(c)),
+        "items": [
+            {
+                "item": f"q{i + 1}",
+                "mean": _round(rc.mean[i]),
+                "sd": _round(np.sqrt(diag[j])),
+                "item_total_r": _round(item_total_r[j]),
+                "alpha_if_deleted": _round(alpha_if_deleted[j]),
+            }
+            for j, i in enumerate(items)
+        ],
+    }
+
+
+def _round(v) -> float:
+    v = float(v)
+    return None if np.isnan(v) else round(v, 4)
+
+
+def report(rc: RunningCovariance) -> dict:
+    return {name: subscale_stats(rc, items) for name, items in SUBSCALES.items()}
+
+
+# =========================
+# outbox 연동 (전송 완료 기록과 같은 트랜잭션)
+# =========================
+def _answers(values: list):
+    row = responses.from_values(values)
+    answers = [row[c] for c in responses.ITEM_COLUMNS]
+    return None if any(a is None for a in answers) else answers
+
+
+def _load(conn) -> RunningCovariance:
+    row = conn.execute("SELECT n, mean, m2 FROM reliability_sent WHERE id = 1").fetchone()
+    return RunningCovariance.from_row(*row) if row else RunningCovariance()
+
+
+def _save(conn, rc: RunningCovariance):
+    conn.execute("INSERT OR REPLACE INTO reliability_sent (id, n, mean, m2) VALUES (1, ?, ?, ?)", rc.to_row())
+
+
+def init(conn):
+    # outbox.connect 가 DB 파일마다 한 번 호출 (트랜잭션 밖)
+    conn.executescript(SCHEMA)
+    if conn.execute("SELECT 1 FROM reliability_sent").fetchone() is None:
+        rebuild(conn)
+
+
+def apply(conn, items: list):
+    # outbox.mark_sent 의 트랜잭션 안에서 호출: items = 이번에 저장된 [(worksheet, 행 값 리스트), ...]
+    new = [a for ws, values in items if ws == "sheet1" for a in [_answers(values)] if a is not None]
+    if not new:
+        return
+    rc = _load(conn)
+    for answers in new:
+        rc.update(answers)
+    _save(conn, rc)
+
+
+def rebuild(conn):
+    # 워크시트에 저장된 sheet1 행 전체로 다시 계산 (처음 만들 때 / 복구용)
+    conn.execute("BEGIN IMMEDIATE")
+    payloads = conn.execute(
+        "SELECT payload FROM outbox WHERE worksheet = 'sheet1' AND sent_at IS NOT NULL ORDER BY id"
+    ).fetchall()
+    answers = [a for (p,) in payloads for a in [_answers(json.loads(p))] if a is not None]
+    _save(conn, RunningCovariance.from_matrix(np.array(answers).reshape(-1, N_ITEMS)))
+    conn.execute("COMMIT")
+
+
+def current(path: str = None) -> RunningCovariance:
+    import outbox
+    with closing(outbox.connect(path)) as conn:
+        return _load(conn)
+
+
+# =========================
+# CLI
+# =========================
+def _print_report(rep: dict):
+    for name, s in rep.items():
+        print(f"[{name}] n={s['n']}  alpha={s['alpha']}")
+        print(f"  {'item':<6}{'mean':>8}{'sd':>8}{'r(it-c)':>10}{'α-del':>9}")
+        for it in s["items"]:
+            print(f"  {it['item']:<6}{it['mean']!s:>8}{it['sd']!s:>8}"
+                  f"{it['item_total_r']!s:>10}{it['alpha_if_deleted']!s:>9}")
+
+
+def main(argv=None):
+    import outbox
+
+    parser = argparse.ArgumentParser(description="감·수·성 하위척도 신뢰도 (Cronbach α)")
+    parser.add_argument("--path", default=outbox.OUTBOX_PATH, help="outbox SQLite 파일 경로")
+    parser.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("show", help="신뢰도 통계 출력")
+    p.add_argument("source", nargs="?", default=None,
+                   help='생략 시 outbox 누적 상태, 지정 시 응답 출처(CSV 경로 | "sheet" | "cache" ...)에서 계산')
+    sub.add_parser("rebuild", help="outbox 의 sheet1 행 전체로 누적 상태 다시 계산")
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        with closing(outbox.connect(args.path)) as conn:
+            rebuild(conn)
+        rc = current(args.path)
+    elif args.source:
+        rows = responses.complete_rows(responses.load(args.source))
+        rc = RunningCovariance.from_matrix(responses.answers_matrix(rows).reshape(-1, N_ITEMS))
+    else:
+        rc = current(args.path)
+
+    rep = report(rc)
+    if args.json:
+        print(json.dumps(rep, ensure_ascii=False, indent=2))
+    else:
+        _print_report(rep)
+
+
+if __name__ == "__main__":
+    main()
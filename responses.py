@@ -0,0 +1,120 @@
+import csv
+import json
+import os
+from contextlib import closing
+
+import numpy as np
+
+import scoring
+
+# =========================
+# 저장된 응답(sheet1) 읽기
+# - 컬럼 순서는 app.py 최종 제출(final_submit)에서 만드는 row dict 와 동일
+# - 출처: 시트에서 내려받은 CSV / 로컬 outbox(SQLite) / Google Sheets 직접 조회 / 증분 동기화 캐시(sheet_sync.py)
+# =========================
+ITEM_COLUMNS = [f"q{i}" for i in range(1, scoring.N_ITEMS + 1)]
+DEMO_COLUMNS = [
+    "연령대", "성별", "경력", "직무", "기관",
+    "인권교육", "정신교육", "대면빈도", "직무소진_거리두기",
+]
+SHEET1_COLUMNS = (
+    ["time", "total", "감", "수", "성", "정신", "전체유형코드", "정신질환유형코드"]
+    + ITEM_COLUMNS
+    + DEMO_COLUMNS
+)
+
+
+def _to_int(v):
+    if v is None or v == "":
+        return None
+    try:
+        return int(float(v))
+    except (TypeError, ValueError, OverflowError):
+        return None  # 시트에 손으로 넣은 값 등 숫자가 아닌 칸 → 빈 값
+
+
+def from_values(values: list) -> dict:
+    # 시트 한 행(값 리스트) → row dict (숫자 컬럼은 int 로)
+    row = {}
+    for col, v in zip(SHEET1_COLUMNS, values):
+        row[col] = v if col == "time" else _to_int(v)
+    for col in SHEET1_COLUMNS[len(values):]:
+        row[col] = None
+    return row
+
+
+def _from_table(values_list: list) -> list:
+    rows = []
+    for values in values_list:
+        if not values or values[0] in ("", "time"):  # 빈 행 / 헤더 행
+            continue
+        rows.append(from_values(values))
+    return rows
+
+
+def read_csv(path: str) -> list:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return _from_table(list(csv.reader(f)))
+
+
+def read_outbox(path: str = None) -> list:
+    import outbox
+    with closing(outbox.connect(path)) as conn:
+        payloads = conn.execute(
+            "SELECT payload FROM outbox WHERE worksheet = 'sheet1' ORDER BY id"
+        ).fetchall()
+    return _from_table([json.loads(p) for (p,) in payloads])
+
+
+def read_sheet() -> list:
+    import sheets
+    return _from_table(sheets.get_pool().worksheet("sheet1").get_all_values())
+
+
+def read_cache(path: str = None) -> list:
+    import sheet_sync
+    return sheet_sync.read_rows("sheet1", path)
+
+
+def load(source: str) -> list:
+    # source: "sheet" | "outbox" | "outbox:<경로>" | "cache" | "cache:<경로>" | <CSV 경로>
+    if source == "sheet":
+        return read_sheet()
+    if source == "cache":
+        return read_cache()
+    if source.startswith("cache:"):
+        return read_cache(source.split(":", 1)[1])
+    if source == "outbox":
+        return read_outbox()
+    if source.startswith("outbox:"):
+        return read_outbox(source.split(":", 1)[1])
+    if not os.path.exists(source):
+        raise FileNotFoundError(source)
+    return read_csv(source)
+
+
+def answers_matrix(rows: list) -> np.ndarray:
+    return np.array([[r[c] for c in ITEM_COLUMNS] for r in rows], dtype=np.int8)
+
+
+def complete_rows(rows: list) -> list:
+    # 27문항이 모두 있는 행만 (채점 가능한 행)
+    return [r for r in rows if all(r.get(c) is not None for c in ITEM_COLUMNS)]
+
+
+def to_results(rows: list) -> list:
+    # 저장된 행 → make_result_pdf 가 받는 result dict (scoring.score_batch 로 일괄 재계산)
+    if not rows:
+        return []
+    b = scoring.score_batch(answers_matrix(rows))
+    results = []
+    for n, row in enumerate(rows):
+        result = {k: int(b[k][n]) for k in scoring.SCORE_KEYS}
+        result["answers"] = [row[c] for c in ITEM_COLUMNS]
+        result["main_type_key"] = scoring.TYPE_KEYS[b["main_type_idx"][n]]
+        result["mh_type_key"] = scoring.TYPE_KEYS[b["mh_type_idx"][n]]
+        result["main_type_code"] = int(b["main_type_code"][n])
+        result["mh_type_code"] = int(b["mh_type_code"][n])
+        result["time_str"] = row["time"]
+        results.append(result)
+    return results
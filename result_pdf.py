@@ -0,0 +1,418 @@
+import argparse
+import contextlib
+import functools
+import math
+import os
+import threading
+import zlib
+from io import BytesIO
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfdoc, pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace
+from reportlab.pdfgen import canvas
+
+import scoring
+from scoring import TYPE_TEXT_MAIN, TYPE_TEXT_MH
+
+# =========================
+# PDF 결과지 (app.py 실시간 화면 / batch_pdf.py 일괄 생성 공용)
+# - 레이더 차트는 reportlab 벡터 경로로 직접 그림 → PDF 생성에 matplotlib 불필요
+# - 폰트 등록은 프로세스당 한 번 (init_fonts), 서버 시작 시 warm_up 으로 미리 준비
+# =========================
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts", "NanumGothicCoding.ttf")
+FONT_NAME = "NanumGothic"
+
+SUBSET_CACHE_SIZE = int(os.environ.get("PDF_SUBSET_CACHE_SIZE", "128"))
+
+# 결과지는 바이너리(다운로드/첨부)로만 전달 → 스트림을 ASCII85 로 한 번 더 감쌀 필요 없음 (크기 +25%)
+ASCII85 = False
+
+_init_lock = threading.Lock()
+_save_lock = threading.Lock()
+_fonts_ready = False
+
+
+# -------------------------------------------
+# 📌 글꼴 subset 캐시
+# - reportlab 은 문서마다 쓰인 글자만 골라 TTF subset 을 새로 만들고(makeSubset) 압축해서 넣음
+# - 결과지의 글자는 고정 문구 + 유형 설명 2개 + 숫자/ASCII 가 전부이고 글자 등록 순서도 같음
+#   → subset 구성은 (전체 유형, 정신질환 유형) 조합마다 항상 같음 → 만든 subset 과 압축본을 재사용
+# - 문서마다 쓰인 글자만 넣는 것은 그대로라 파일 크기는 늘지 않음
+# -------------------------------------------
+@functools.lru_cache(maxsize=SUBSET_CACHE_SIZE)
+def _subset_bytes(face, subset: tuple) -> tuple:
+    # -> (subset TTF 원본, zlib 압축본)
+    raw = TTFontFace.makeSubset(face, list(subset))
+    return raw, zlib.compress(raw, 9)
+
+
+class _SubsetCachedFace(TTFontFace):
+    def makeSubset(self, subset):
+        return _subset_bytes(self, tuple(subset))[0]
+
+    def addSubsetObjects(self, doc, fontname, subset):
+        ref = super().addSubsetObjects(doc, fontname, subset)
+        if doc.compression:
+            # 미리 압축한 바이트로 교체 (Filter 가 이미 있으면 저장 시 다시 압축하지 않음)
+            font_file = doc.idToObject["fontFile:%s(%s)" % (self.filename, fontname)]
+            font_file.content = _subset_bytes(self, tuple(subset))[1]
+            font_file.dictionary["Filter"] = pdfdoc.PDFArray([pdfdoc.PDFName(pdfdoc.PDFZCompress.pdfname)])
+        return ref
+
+
+def subset_cache_info():
+    return _subset_bytes.cache_info()
+
+
+# -------------------------------------------
+# 📌 ASCII85 설정은 결과지 캔버스에만
+# - reportlab 은 저장(c.save) 시점에 전역 rl_config.useA85 를 읽어 스트림 필터를 정함
+#   → 결과지를 저장하는 동안만 바꾸고 되돌림 (같은 프로세스의 다른 PDF 생성에는 기본값 유지)
+# -------------------------------------------
+@contextlib.contextmanager
+def _ascii85(enabled: bool):
+    with _save_lock:
+        saved = rl_config.useA85
+        rl_config.useA85 = int(enabled)
+        try:
+            yield
+        finally:
+            rl_config.useA85 = saved
+
+
+# -------------------------------------------
+# 📌 reportlab 한글 폰트 등록 (TTF 파싱은 프로세스당 한 번)
+# -------------------------------------------
+def init_fonts():
+    global _fonts_ready
+    if _fonts_ready:
+        return
+    with _init_lock:
+        if not _fonts_ready:
+            if FONT_NAME not in pdfmetrics.getRegisteredFontNames():
+                font = TTFont(FONT_NAME, FONT_PATH)
+                font.face.__class__ = _SubsetCachedFace  # 파싱된 face 를 그대로 두고 subset 생성만 캐시 사용
+                pdfmetrics.registerFont(font)
+            _fonts_ready = True
+
+
+# =========================
+# 레이더 차트(PDF용 reportlab 벡터)
+# - matplotlib 극좌표 기본값과 같은 배치: 감(0°, 오른쪽)에서 반시계 방향으로 수·성
+# - 이전 PNG 렌더러의 점수 프로파일 캐시(메모리 LRU / 디스크 / warm-radar)는 이 경로로 대체됨:
+#   격자는 고정 층 form 으로 문서마다 한 번, 응답자별 계열은 다각형 2개(약 0.1ms)라 캐시할 비용이 없음
+# =========================
+RADAR_LABELS = ["감", "수", "성"]
+RADAR_MAX = 36
+RADAR_RINGS = [9, 18, 27, 36]
+RADAR_MAX_MH = 12  # 정신질환 상황 요인만 따로 그릴 때 (3문항 × 4점)
+RADAR_SERIES_COLORS = [colors.HexColor("#1f77b4"), colors.HexColor("#ff7f0e")]  # 전체 / 정신질환 상황
+
+
+def _radar_rings(max_value):
+    # 눈금 4칸 (기본 36 → RADAR_RINGS)
+    return RADAR_RINGS if max_value == RADAR_MAX else [max_value * k // 4 for k in range(1, 5)]
+
+
+def _radar_points(cx, cy, radius, values, max_value=RADAR_MAX):
+    pts = []
+    for k, v in enumerate(values):
+        theta = 2 * math.pi * k / len(values)
+        r = radius * max(0, min(v, max_value)) / max_value
+        pts.append((cx + r * math.cos(theta), cy + r * math.sin(theta)))
+    return pts
+
+
+def _polygon(c, pts, stroke=1, fill=0):
+    path = c.beginPath()
+    path.moveTo(*pts[0])
+    for pt in pts[1:]:
+        path.lineTo(*pt)
+    path.close()
+    c.drawPath(path, stroke=stroke, fill=fill)
+
+
+def _radar_geometry(x, y, size):
+    # (x, y): 차트 영역 왼쪽 아래, size: 한 변 길이 → 중심과 반지름
+    return x + size / 2, y + size / 2, size / 2 * 0.78
+
+
+def draw_radar_grid(c, x, y, size, max_value=RADAR_MAX):
+    # 고정 부분: 동심원, 축, 눈금 숫자, 축 이름
+    init_fonts()
+    cx, cy, radius = _radar_geometry(x, y, size)
+    n = len(RADAR_LABELS)
+
+    c.saveState()
+
+    # 격자(동심원)와 축
+    c.setStrokeColor(colors.HexColor("#d0d0d0"))
+    c.setLineWidth(0.4)
+    rings = _radar_rings(max_value)
+    for ring in rings:
+        c.circle(cx, cy, radius * ring / max_value, stroke=1, fill=0)
+    for px, py in _radar_points(cx, cy, radius, [max_value] * n, max_value):
+        c.line(cx, cy, px, py)
+
+    c.setFillColor(colors.HexColor("#808080"))
+    c.setFont(FONT_NAME, 5)
+    tick_angle = math.pi / n  # 감·수 축 사이에 눈금 표시
+    for ring in rings:
+        r = radius * ring / max_value
+        c.drawString(cx + r * math.cos(tick_angle) + 1, cy + r * math.sin(tick_angle), str(ring))
+
+    # 축 이름(감/수/성)
+    c.setFillColor(colors.black)
+    c.setFont(FONT_NAME, 9)
+    for label, (px, py) in zip(RADAR_LABELS, _radar_points(cx, cy, radius * 1.14, [max_value] * n, max_value)):
+        c.drawCentredString(px, py - 3, label)
+
+    c.restoreState()
+
+
+def draw_radar_series(c, x, y, size, values_total, values_mh, max_value=RADAR_MAX):
+    # 응답자별 부분: 두 계열(반투명 채우기 + 외곽선)
+    cx, cy, radius = _radar_geometry(x, y, size)
+
+    c.saveState()
+    c.setLineWidth(1)
+    for values, color in zip([values_total, values_mh], RADAR_SERIES_COLORS):
+        pts = _radar_points(cx, cy, radius, values, max_value)
+        c.setStrokeColor(color)
+        c.setFillColor(color)
+        c.setFillAlpha(0.2)
+        _polygon(c, pts, stroke=0, fill=1)
+        c.setFillAlpha(1)
+        _polygon(c, pts, stroke=1, fill=0)
+
+    c.restoreState()
+
+
+def draw_radar(c, x, y, size, values_total, values_mh, max_value=RADAR_MAX):
+    # max_value: 축 최대값 — 두 계열이 같은 범위여야 함 (결과지는 전체 문항 기준 36)
+    draw_radar_grid(c, x, y, size, max_value)
+    draw_radar_series(c, x, y, size, values_total, values_mh, max_value)
+
+
+# =========================
+# 결과지 레이아웃 (위치·고정 문구는 여기서만 정의)
+# =========================
+PAGE_WIDTH, PAGE_HEIGHT = A4
+MARGIN_X = 25 * mm
+MARGIN_Y = 20 * mm
+TOP_Y = PAGE_HEIGHT - MARGIN_Y
+
+TIME_Y = TOP_Y - 18 * mm            # 응답 일시
+SCORES_Y = TOP_Y - 24 * mm          # 점수 요약
+CHART_SIZE = 55 * mm
+CHART_X = (PAGE_WIDTH - CHART_SIZE) / 2
+CHART_Y = SCORES_Y - 10 * mm - CHART_SIZE + 5 * mm
+BODY_TOP_Y = CHART_Y - 12 * mm      # 유형 설명 시작
+BODY_WIDTH = PAGE_WIDTH - 2 * MARGIN_X
+
+TITLE_SIZE, TITLE_GAP = 11, 6 * mm  # 유형 설명 제목 글자 크기, 제목 아래 간격
+BODY_SIZE, BODY_LEADING = 9, 4 * mm  # 본문 글자 크기, 줄 간격
+PARAGRAPH_GAP = 6 * mm              # 본문 마지막 줄 아래 간격
+
+DISCLAIMER = (
+    "※ 본 결과지는 자가점검용 비임상·비진단 자료이며, "
+    "인사평가·법적 판단의 근거로 사용할 수 없습니다."
+)
+
+# 고정 문구: (글자 크기, x, y, 문구) — 그리는 순서 그대로
+STATIC_TEXT = [
+    (18, MARGIN_X, TOP_Y, "나의 감·수·성 인권감수성 결과"),
+    (9, MARGIN_X, TOP_Y - 10 * mm, "※ 자가점검용 요약 결과지(비진단·비평가)"),
+    (8, MARGIN_X, MARGIN_Y, DISCLAIMER),
+]
+# 고정 층에서 그리는 글자 전체 (그리는 순서대로: 고정 문구 → 레이더 눈금 숫자 → 축 이름)
+STATIC_STRINGS = [text for *_, text in STATIC_TEXT] + [str(r) for r in RADAR_RINGS] + RADAR_LABELS
+
+STATIC_FORM = "result_static"
+
+
+def draw_static_layer(c):
+    # 모든 결과지에 똑같이 들어가는 층: 제목, 비진단 안내, 하단 고지, 레이더 격자
+    for size, x, y, text in STATIC_TEXT:
+        c.setFont(FONT_NAME, size)
+        c.drawString(x, y, text)
+    draw_radar_grid(c, CHART_X, CHART_Y, CHART_SIZE)
+
+
+# -------------------------------------------
+# 📌 고정 층 재사용
+# - 고정 층은 form XObject 로 한 번 그리고 페이지에서 참조(doForm)
+# - 첫 결과지에서 만든 form 의 PDF 연산자 목록을 보관 → 이후 결과지는 다시 그리지 않고 붙여 넣기만 함
+# - TTF 글꼴 subset 은 문서마다 따로라 글자 코드는 "처음 쓰인 순서"로 정해짐
+#   → 고정 층 글자를 매 문서 맨 처음에 같은 순서로 등록해 두면 보관한 연산자의 글자 코드가 그대로 맞음
+# -------------------------------------------
+_static_ops = None
+
+
+def _seed_static_glyphs(c):
+    font = pdfmetrics.getFont(FONT_NAME)
+    for text in STATIC_STRINGS:
+        for subset, _ in font.splitString(text, c._doc):
+            font.getSubsetInternalName(subset, c._doc)
+
+
+def _stamp_static_layer(c):
+    global _static_ops
+    c.beginForm(STATIC_FORM)
+    if _static_ops is None:
+        draw_static_layer(c)
+        ops = list(c._code)
+    else:
+        _seed_static_glyphs(c)
+        c._code.extend(_static_ops)
+        ops = None
+    c.endForm()
+    if ops is not None:
+        _static_ops = ops
+    c.doForm(STATIC_FORM)
+
+
+# -------------------------------------------
+# 📌 유형 설명 줄바꿈 캐시
+# - 등록된 글꼴의 실제 글자 폭으로 BODY_WIDTH 안에 들어가게 단어 단위로 줄바꿈
+#   (한글/영문 폭이 달라 글자 수 기준으로 자르면 줄이 넘치거나 짧게 끊김)
+# - 본문의 줄바꿈(\n)은 그대로 줄을 나눔
+# - 유형 설명은 10개뿐 → 문단별로 (줄 목록, 높이)를 한 번만 계산해 두고 재사용
+# -------------------------------------------
+def _wrap_line(text: str, size: float, width: float) -> list:
+    def width_of(s):
+        return pdfmetrics.stringWidth(s, FONT_NAME, size)
+
+    lines, line = [], ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if width_of(candidate) <= width:
+            line = candidate
+            continue
+        if line:
+            lines.append(line)
+        # 한 단어가 한 줄보다 길면 글자 단위로 자름
+        line = ""
+        for ch in word:
+            if line and width_of(line + ch) > width:
+                lines.append(line)
+                line = ""
+            line += ch
+    if line:
+        lines.append(line)
+    return lines
+
+
+@functools.lru_cache(maxsize=None)
+def paragraph_layout(body: str, size: float = BODY_SIZE, width: float = BODY_WIDTH) -> tuple:
+    # -> (줄 목록, 본문 높이: 첫 줄 기준선부터 다음 문단 제목 기준선까지)
+    init_fonts()
+    lines = []
+    for part in body.split("\n"):
+        lines.extend(_wrap_line(part, size, width))
+    lines = tuple(lines)
+    height = (len(lines) - 1) * BODY_LEADING + PARAGRAPH_GAP if lines else 0
+    return lines, height
+
+
+# =========================
+# PDF 결과지 생성 (유형 중심)
+# - 고정 층(_stamp_static_layer) 위에 응답자별 내용(일시, 점수, 레이더 계열, 유형 설명)만 그림
+# =========================
+def make_result_pdf(result: dict, demographic=None, ascii85: bool = None) -> bytes:
+    init_fonts()
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    _stamp_static_layer(c)
+
+    total = result["total"]
+    gam = result["감"]
+    su = result["수"]
+    seong = result["성"]
+    mental = result["정신"]
+
+    mh_gam = result.get("mh_gam", 0)
+    mh_su = result.get("mh_su", 0)
+    mh_seong = result.get("mh_seong", 0)
+
+    main_type_key = result.get("main_type_key", "normal")
+    mh_type_key = result.get("mh_type_key", "normal")
+
+    c.setFont(FONT_NAME, 9)
+    c.drawString(MARGIN_X, TIME_Y, f"응답 일시: {result.get('time_str', '')}")
+
+    c.setFont(FONT_NAME, 10)
+    c.drawString(
+        MARGIN_X, SCORES_Y,
+        f"총점: {total}점 | 감: {gam}점  수: {su}점  성: {seong}점 | (정신질환 9문항: {mental}점)"
+    )
+
+    draw_radar_series(c, CHART_X, CHART_Y, CHART_SIZE,
+                      (gam, su, seong), (mh_gam, mh_su, mh_seong))
+
+    y = BODY_TOP_Y
+
+    def draw_paragraph(title, body):
+        nonlocal y
+        lines, height = paragraph_layout(body)
+        # 제목과 본문이 첫 페이지 하단 고지(MARGIN_Y)에 겹치면 다음 페이지로
+        if y - TITLE_GAP - height < MARGIN_Y + PARAGRAPH_GAP:
+            c.showPage()
+            y = TOP_Y
+
+        c.setFont(FONT_NAME, TITLE_SIZE)
+        c.drawString(MARGIN_X, y, title)
+        y -= TITLE_GAP
+
+        text = c.beginText(MARGIN_X, y)
+        text.setFont(FONT_NAME, BODY_SIZE, BODY_LEADING)
+        text.textLines(lines)
+        c.drawText(text)
+        y -= height
+
+    draw_paragraph("【전체(27문항) 유형】", TYPE_TEXT_MAIN.get(main_type_key, TYPE_TEXT_MAIN["normal"]))
+    draw_paragraph("【정신질환 상황(9문항) 유형】", TYPE_TEXT_MH.get(mh_type_key, TYPE_TEXT_MH["normal"]))
+
+    with _ascii85(ASCII85 if ascii85 is None else ascii85):
+        c.save()
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
+
+
+# =========================
+# 서버 시작 시 예열
+# - 폰트 등록, 유형 설명 줄바꿈, 첫 PDF 생성 경로까지 미리 준비
+# - 유형 조합(5 x 5)마다 결과지를 한 번씩 만들어 글꼴 subset 캐시를 모두 채움
+# =========================
+def warm_up():
+    init_fonts()
+    for text in list(TYPE_TEXT_MAIN.values()) + list(TYPE_TEXT_MH.values()):
+        paragraph_layout(text)
+    sample = scoring.score_one([3] * scoring.N_ITEMS)
+    sample["time_str"] = "0000-00-00 00:00:00"
+    for main_key in scoring.TYPE_KEYS:
+        for mh_key in scoring.TYPE_KEYS:
+            make_result_pdf(dict(sample, main_type_key=main_key, mh_type_key=mh_key))
+
+
+# =========================
+# CLI: python result_pdf.py warm-up
+# - 배포 직후 폰트 등록/subset 캐시 생성 경로가 정상인지 확인
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="결과지 렌더러 예열")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("warm-up", help="폰트/렌더러 초기화 및 캐시 생성")
+    parser.parse_args(argv)
+
+    warm_up()
+    print("renderer warmed up", subset_cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import numpy as np
+
+# =========================
+# 감·수·성 27문항 채점/유형 분류
+# - 스칼라 함수: 1명 기준 분류 규칙 (기준 구현)
+# - score_batch: (N, 27) 응답 행렬을 한 번에 채점·분류 (실시간 화면은 N=1 로 동일 엔진 사용)
+# =========================
+N_ITEMS = 27
+MH_ITEMS = [7, 8, 9, 16, 17, 18, 25, 26, 27]  # 1-indexed, 정신질환 상황 문항
+
+
+# =========================
+# ✅ 총점 기준 “보통형 vs 4유형” 분류 로직
+# =========================
+def overall_level(total: int) -> str:
+    # 27~108
+    if total <= 67:
+        return "low"
+    elif total <= 87:
+        return "mid"
+    else:
+        return "high"
+
+
+def mental_level(score: int) -> str:
+    # 9~36 (정신질환 9문항 합)
+    if score >= 27:
+        return "high"
+    elif score >= 20:
+        return "mid"
+    else:
+        return "low"
+
+
+TYPE_TEXT_MAIN = {
+    "balance": """✅ 균형형
+본 설문 응답에서 감·수·성 3요인이 비교적 고르게 분포한 유형입니다. 판단 과정에서 감정 인식, 기준 적용, 성찰이 함께 고려되는 양상이 반영되었습니다.""",
+
+    "emotion": """✅ 감우수형
+본 설문 응답에서 감(감정 인식·공감) 요인이 상대적으로 두드러진 분포를 보인 유형입니다. 판단 과정에서 정서적 신호나 관계적 단서가 먼저 고려되는 경향이 반영되었습니다.""",
+
+    "norm": """✅ 수우수형
+본 설문 응답에서 수(기준·절차·비례성) 요인이 상대적으로 두드러진 분포를 보인 유형입니다. 판단 시 규정과 기준을 중심으로 상황을 정리하려는 양상이 반영되었습니다.""",
+
+    "reflect": """✅ 성우수형
+본 설문 응답에서 성(성찰·자기점검) 요인이 상대적으로 두드러진 분포를 보인 유형입니다. 사건 이후 자신의 판단과 대응을 돌아보는 양상이 응답에 반영되었습니다.""",
+
+    "normal": """✅ 보통형
+본 설문 응답에서 감·수·성 요인이 전반적으로 중간 범위에 분포한 유형입니다. 특정 요인이 두드러지기보다는, 상황이나 조건에 따라 판단 구조가 달라질 가능성이 응답에 반영되었습니다."""
+}
+
+
+TYPE_TEXT_MH = {
+    "balance": """✅ (정신건강 문제 상황) 균형형
+정신건강 문제있는 수용자 관련 문항 응답에서 감·수·성 요인이 비교적 고르게 분포한 유형입니다. 해당 상황에서도 여러 판단 요소가 함께 고려되는 양상이 반영되었습니다.""",
+
+    "emotion": """✅ (정신건강 문제 상황) 감우수형
+정신건강 문제있는 수용자 관련 문항 응답에서 감(정서 인식·공감) 요인이 상대적으로 두드러진 분포를 보인 유형입니다. 정서적 신호를 중심으로 상황을 인식하는 양상이 반영되었습니다.""",
+
+    "norm": """✅ (정신건강 문제 상황) 수우수형
+정신건강 문제있는 수용자 관련 문항 응답에서 수(기준·절차·비례성) 요인이 상대적으로 두드러진 분포를 보인 유형입니다. 기준과 절차를 중심으로 판단을 정리하려는 양상이 반영되었습니다.""",
+
+    "reflect": """✅ (정신건강 문제 상황) 성우수형
+정신건강 문제있는 수용자 관련 문항 응답에서 성(성찰·자기점검) 요인이 상대적으로 두드러진 분포를 보인 유형입니다. 대응 이후 판단을 되돌아보는 양상이 응답에 반영되었습니다.""",
+
+    "normal": """✅ (정신건강 문제 상황) 보통형
+정신건강 문제있는 수용자 관련 문항 응답에서 전반적인 점수 분포가 중간 범위에 위치한 유형입니다. 이 영역은 상황의 난이도, 경험, 지원 조건 등의 영향을 크게 받을 수 있음이 응답 양상에 반영되었습니다."""
+}
+
+
+# =========================
+# ✅ 유형 코드(명목척도) 매핑
+# - 서열 의미 없음(단순 식별 코드)
+# =========================
+TYPE_CODE_MAIN = {
+    "balance": 1,   # 균형형
+    "emotion": 2,   # 감우수형
+    "norm": 3,      # 수우수형
+    "reflect": 4,   # 성우수형
+    "normal": 5     # 보통형
+}
+
+
+TYPE_CODE_MH = {
+    "balance": 11,  # 정신질환 상황: 균형형
+    "emotion": 12,  # 정신질환 상황: 감우수형
+    "norm": 13,     # 정신질환 상황: 수우수형
+    "reflect": 14,  # 정신질환 상황: 성우수형
+    "normal": 15    # 정신질환 상황: 보통형
+}
+
+# 유형 이름 (집단 보고서 등 표기용)
+TYPE_NAMES = {
+    "balance": "균형형",
+    "emotion": "감우수형",
+    "norm": "수우수형",
+    "reflect": "성우수형",
+    "normal": "보통형"
+}
+
+
+def classify_4type_by_scores(gam_score: int, su_score: int, seong_score: int,
+                             mid_cut: int, balance_gap: int) -> str:
+    # 균형형: 모두 mid_cut 이상 & max-min이 작음
+    if (gam_score >= mid_cut) and (su_score >= mid_cut) and (seong_score >= mid_cut):
+        if (max(gam_score, su_score, seong_score) - min(gam_score, su_score, seong_score)) <= balance_gap:
+            return "balance"
+
+    # 우수형: 최댓값 축(동점이면 감 > 수 > 성)
+    scores = {"emotion": gam_score, "norm": su_score, "reflect": seong_score}
+    max_val = max(scores.values())
+    for k in ["emotion", "norm", "reflect"]:
+        if scores[k] == max_val:
+            return k
+    return "balance"
+
+
+def classify_main_type(total: int, gam: int, su: int, seong: int) -> str:
+    # 총점이 중간 미만(low) -> 보통형
+    if overall_level(total) == "low":
+        return "normal"
+    # 9문항 합(9~36)에서 중간 시작점 19, 균형 허용 격차 3
+    return classify_4type_by_scores(gam, su, seong, mid_cut=19, balance_gap=3)
+
+
+def classify_mental_type(mental_total: int, mh_gam: int, mh_su: int, mh_seong: int) -> str:
+    # 정신질환 9문항 총점이 중간 미만(low) -> 보통형
+    if mental_level(mental_total) == "low":
+        return "normal"
+    # 3문항 합(3~12)에서 중간 시작점 7, 균형 허용 격차 2
+    return classify_4type_by_scores(mh_gam, mh_su, mh_seong, mid_cut=7, balance_gap=2)
+
+
+# =========================
+# ✅ 배치 채점 엔진 (벡터화)
+# =========================
+TYPE_KEYS = ["balance", "emotion", "norm", "reflect", "normal"]
+MAIN_CODES = np.array([TYPE_CODE_MAIN[k] for k in TYPE_KEYS], dtype=np.int8)
+MH_CODES = np.array([TYPE_CODE_MH[k] for k in TYPE_KEYS], dtype=np.int8)
+
+SCORE_KEYS = ["total", "감", "수", "성", "정신", "mh_gam", "mh_su", "mh_seong"]
+
+
+def _score_weights() -> np.ndarray:
+    # 각 점수 = 응답 행렬 @ 가중치 열 (0/1) → 모든 합계를 행렬곱 한 번으로 계산
+    w = np.zeros((N_ITEMS, len(SCORE_KEYS)), dtype=np.float32)
+    w[:, 0] = 1
+    w[0:9, 1] = 1
+    w[9:18, 2] = 1
+    w[18:27, 3] = 1
+    w[[i - 1 for i in MH_ITEMS], 4] = 1
+    w[6:9, 5] = 1      # 7~9
+    w[15:18, 6] = 1    # 16~18
+    w[24:27, 7] = 1    # 25~27
+    return w
+
+
+SCORE_WEIGHTS = _score_weights()
+
+
+def _classify_batch(low: np.ndarray, axes: np.ndarray, mid_cut: int, balance_gap: int) -> np.ndarray:
+    # classify_4type_by_scores 와 같은 규칙, TYPE_KEYS 인덱스 반환
+    hi = axes.max(axis=1)
+    lo = axes.min(axis=1)
+    balance = (lo >= mid_cut) & ((hi - lo) <= balance_gap)
+    top = axes.argmax(axis=1) + 1  # 동점이면 첫 축 우선(감 > 수 > 성)
+    idx = np.where(balance, 0, top)
+    return np.where(low, TYPE_KEYS.index("normal"), idx).astype(np.int8)
+
+
+def score_batch(answers) -> dict:
+    a = np.asarray(answers, dtype=np.int8)
+    if a.ndim == 1:
+        a = a[np.newaxis, :]
+    if a.shape[1] != N_ITEMS:
+        raise ValueError(f"expected (N, {N_ITEMS}) answers, got {a.shape}")
+
+    sums = np.rint(a.astype(np.float32) @ SCORE_WEIGHTS).astype(np.int16)
+    out = {k: sums[:, j] for j, k in enumerate(SCORE_KEYS)}
+
+    # 총점 low(<=67) / 정신 low(<20) → 보통형
+    main_idx = _classify_batch(out["total"] <= 67, sums[:, 1:4], mid_cut=19, balance_gap=3)
+    mh_idx = _classify_batch(out["정신"] < 20, sums[:, 5:8], mid_cut=7, balance_gap=2)
+    out["main_type_idx"] = main_idx
+    out["mh_type_idx"] = mh_idx
+    out["main_type_code"] = MAIN_CODES[main_idx]
+    out["mh_type_code"] = MH_CODES[mh_idx]
+    return out
+
+
+def score_one(answers: list) -> dict:
+    # 실시간 화면/PDF 용 결과 dict (세션에 저장되는 형태)
+    b = score_batch([answers])
+    result = {k: int(b[k][0]) for k in SCORE_KEYS}
+    result["answers"] = [int(x) for x in answers]
+    result["main_type_key"] = TYPE_KEYS[b["main_type_idx"][0]]
+    result["mh_type_key"] = TYPE_KEYS[b["mh_type_idx"][0]]
+    result["main_type_code"] = int(b["main_type_code"][0])
+    result["mh_type_code"] = int(b["mh_type_code"][0])
+    return result
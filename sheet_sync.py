@@ -0,0 +1,249 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+
+import responses
+
+# =========================
+# 응답 워크시트 증분 동기화 → 로컬 SQLite 캐시
+# 예) python sheet_sync.py sync               (sheet1, feedback)
+#     python sheet_sync.py sync sheet1 --chunk 1000
+#     python sheet_sync.py status
+# - 워크시트마다 마지막으로 받은 행 번호와 그 행의 키(cursor)를 기록 → 다음 동기화는 그 다음 행부터만 요청
+# - 한 번에 chunk 행씩 범위 조회(A{시작}:{끝열}{끝}), 덜 찬 chunk 가 오면 끝
+# - chunk 마다 행 저장과 cursor 갱신을 한 트랜잭션으로 → 중간에 끊겨도 이어서 동기화
+# - 행은 키(time 포함 행 내용의 해시)로 저장 → 같은 행을 다시 받아도 한 번만 저장
+# - 직전 마지막 행을 한 줄 겹쳐 받아 키 비교 → 위쪽 행이 지워져 밀렸으면 그 행을 찾아 cursor 를 옮기고 계속
+#   (못 찾으면 처음부터 다시 훑되 이미 받은 행은 키로 건너뜀)
+# - sheet1 컬럼/타입은 app.py 최종 제출 row dict 와 동일 (responses.SHEET1_COLUMNS)
+# - 📌 phone 워크시트는 캐시하지 않음 (연락처는 outbox 에서도 전송 후 지움 → 평문 사본을 남기지 않음)
+# =========================
+CACHE_PATH = os.environ.get("SHEET_CACHE_PATH", "sheet_cache.sqlite3")
+CHUNK_ROWS = 500
+CACHE_VERSION = 2  # PRAGMA user_version — 1: sheet_row 키 + phone 캐시 (이전 형식, 열 때 지우고 다시 받음)
+
+# 워크시트 → [(컬럼 이름, SQLite 타입)]
+WORKSHEETS = {
+    "sheet1": [(c, "TEXT" if c == "time" else "INTEGER") for c in responses.SHEET1_COLUMNS],
+    "feedback": [("time", "TEXT"), ("text", "TEXT")],
+}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _table(worksheet: str) -> str:
+    return _quote(f"ws_{worksheet}")
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    conn = sqlite3.connect(path or CACHE_PATH, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA secure_delete=ON")  # 지운 phone 캐시가 파일에 남지 않게
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    if version != CACHE_VERSION:
+        # 이전 형식 캐시 → 테이블(ws_phone 포함)을 모두 지우고 처음부터 다시 받음
+        conn.execute("BEGIN IMMEDIATE")
+        tables = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        for (name,) in tables:
+            if name == "sync_cursor" or name.startswith("ws_"):
+                conn.execute(f"DROP TABLE {_quote(name)}")
+        conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        conn.execute("COMMIT")
+        conn.execute("VACUUM")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sync_cursor ("
+        "worksheet TEXT PRIMARY KEY, last_row INTEGER NOT NULL, "
+        "last_key TEXT, synced_at REAL)"
+    )
+    for ws, columns in WORKSHEETS.items():
+        cols = ", ".join(f"{_quote(c)} {t}" for c, t in columns)
+        # sheet_row: 처음 받았을 때의 행 번호 (위쪽 행이 지워지면 시트와 달라질 수 있음, 순서는 rowid)
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {_table(ws)} (row_key TEXT PRIMARY KEY, sheet_row INTEGER, {cols})"
+        )
+    return conn
+
+
+def row_key(values: list) -> str:
+    # time 을 포함한 행 내용 전체의 해시 → 행이 밀려도 같은 행이면 같은 키
+    raw = json.dumps([str(v) for v in values], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _typed(worksheet: str, values: list) -> list:
+    if worksheet == "sheet1":
+        row = responses.from_values(values)  # 숫자가 아닌 칸은 None
+        return [row[c] for c in responses.SHEET1_COLUMNS]
+    n = len(WORKSHEETS[worksheet])
+    values = [None if v == "" else str(v) for v in values[:n]]
+    return values + [None] * (n - len(values))
+
+
+def _is_header(values: list) -> bool:
+    return bool(values) and values[0] == "time"
+
+
+def _bad_cells(worksheet: str, values: list, typed: list) -> list:
+    # 값이 있었는데 None 이 된 칸 (sheet1 숫자 컬럼에 숫자가 아닌 값)
+    columns = [c for c, _ in WORKSHEETS[worksheet]]
+    return [c for c, v, t in zip(columns, values, typed) if v not in ("", None) and t is None]
+
+
+def cursor(conn, worksheet: str) -> tuple:
+    row = conn.execute(
+        "SELECT last_row, last_key FROM sync_cursor WHERE worksheet = ?", (worksheet,)
+    ).fetchone()
+    return (row[0], row[1]) if row else (0, None)
+
+
+def _fetch(ws, first_row: int, last_row: int, n_cols: int) -> list:
+    from gspread.utils import ValueRenderOption, rowcol_to_a1
+
+    a1 = f"{rowcol_to_a1(first_row, 1)}:{rowcol_to_a1(last_row, n_cols)}"
+    return list(ws.get(a1, value_render_option=ValueRenderOption.unformatted))
+
+
+def _locate(ws, key: str, last_row: int, n_cols: int) -> int:
+    # 위쪽 행이 지워져 마지막으로 받은 행이 올라간 위치 (못 찾으면 0)
+    values = _fetch(ws, 1, last_row, n_cols)
+    for k in range(len(values) - 1, -1, -1):
+        if values[k] and row_key(values[k]) == key:
+            return k + 1
+    return 0
+
+
+def sync_worksheet(conn, worksheet: str, ws, chunk: int = CHUNK_ROWS) -> int:
+    # 새로 받은 행 수 반환. ws: gspread Worksheet (또는 같은 get() 을 가진 객체)
+    columns = WORKSHEETS[worksheet]
+    table = _table(worksheet)
+    insert = (
+        f"INSERT OR IGNORE INTO {table} (row_key, sheet_row, {', '.join(_quote(c) for c, _ in columns)}) "
+        f"VALUES (?, ?, {', '.join('?' for _ in columns)})"
+    )
+    last_row, last_key = cursor(conn, worksheet)
+    relocated = False
+    added = 0
+    while True:
+        # 직전 마지막 행을 한 줄 겹쳐 받아 시트가 그대로인지 확인
+        overlap = 1 if last_row > 0 else 0
+        first = last_row + 1 - overlap
+        values = _fetch(ws, first, first + overlap + chunk - 1, len(columns))
+        if overlap:
+            seen = values[0] if values else []
+            if row_key(seen) != last_key:
+                # 위쪽 행 삭제(연락처 정리 등)로 밀림 → 마지막 행을 찾아 이어서, 두 번째로 어긋나면 처음부터
+                last_row = 0 if relocated else _locate(ws, last_key, last_row, len(columns))
+                relocated = True
+                continue
+            values = values[1:]
+
+        rows = []
+        for k, v in enumerate(values):
+            if not v or _is_header(v):
+                continue  # 빈 행 / 헤더 행은 건너뜀 (행 번호는 유지)
+            typed = _typed(worksheet, v)
+            bad = _bad_cells(worksheet, v, typed)
+            if bad:
+                print(f"{worksheet} {last_row + 1 + k}행: 숫자가 아닌 값 → 비움 {bad}", file=sys.stderr)
+            rows.append((row_key(v), last_row + 1 + k, *typed))
+        if values:
+            last_row += len(values)
+            last_key = row_key(values[-1])
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            conn.executemany(insert, rows)
+            added += conn.total_changes - before  # 이미 받은 행(키 중복)은 세지 않음
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_cursor (worksheet, last_row, last_key, synced_at) "
+                "VALUES (?, ?, ?, ?)",
+                (worksheet, last_row, last_key, time.time()),
+            )
+            conn.execute("COMMIT")
+        if len(values) < chunk:
+            break
+    return added
+
+
+def reset(conn, worksheet: str):
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute(f"DELETE FROM {_table(worksheet)}")
+    conn.execute("DELETE FROM sync_cursor WHERE worksheet = ?", (worksheet,))
+    conn.execute("COMMIT")
+
+
+def sync(worksheets: list = None, chunk: int = CHUNK_ROWS, full: bool = False, path: str = None) -> dict:
+    import sheets
+    pool = sheets.get_pool()
+    out = {}
+    with closing(connect(path)) as conn:
+        for name in worksheets or list(WORKSHEETS):
+            if full:
+                reset(conn, name)
+            try:
+                with pool.timed("sync_read"):
+                    out[name] = sync_worksheet(conn, name, pool.worksheet(name), chunk)
+            except Exception as e:
+                if sheets.needs_reconnect(e):
+                    pool.invalidate()  # 인증 만료/권한 변경/시트 삭제 → 다음 호출에서 다시 연결
+                raise
+    return out
+
+
+def status(path: str = None) -> dict:
+    with closing(connect(path)) as conn:
+        out = {}
+        for name in WORKSHEETS:
+            (count,) = conn.execute(f"SELECT COUNT(*) FROM {_table(name)}").fetchone()
+            row = conn.execute(
+                "SELECT last_row, synced_at FROM sync_cursor WHERE worksheet = ?", (name,)
+            ).fetchone()
+            out[name] = {
+                "rows": count,
+                "last_row": row[0] if row else 0,
+                "synced_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row[1])) if row and row[1] else None,
+            }
+    return out
+
+
+def read_rows(worksheet: str = "sheet1", path: str = None) -> list:
+    # 캐시 → row dict 목록 (sheet1 은 responses.from_values 와 같은 모양)
+    columns = [c for c, _ in WORKSHEETS[worksheet]]
+    with closing(connect(path)) as conn:
+        cur = conn.execute(
+            f"SELECT {', '.join(_quote(c) for c in columns)} FROM {_table(worksheet)} ORDER BY rowid"
+        )
+        return [dict(zip(columns, values)) for values in cur]
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="응답 워크시트 증분 동기화 (로컬 SQLite 캐시)")
+    parser.add_argument("--path", default=CACHE_PATH, help="캐시 SQLite 파일 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("sync", help="새 행만 받아 캐시에 추가")
+    p.add_argument("worksheets", nargs="*", help=f"대상 워크시트 {list(WORKSHEETS)} (기본: 전체)")
+    p.add_argument("--chunk", type=int, default=CHUNK_ROWS, help="한 번에 요청할 행 수")
+    p.add_argument("--full", action="store_true", help="캐시를 비우고 처음부터 다시 받기")
+    sub.add_parser("status", help="워크시트별 캐시 행 수와 cursor")
+    args = parser.parse_args(argv)
+
+    if args.command == "sync":
+        unknown = [w for w in args.worksheets if w not in WORKSHEETS]
+        if unknown:
+            parser.error(f"알 수 없는 워크시트: {unknown}")
+        added = sync(args.worksheets or None, args.chunk, args.full, args.path)
+        print(json.dumps(added, ensure_ascii=False))
+    print(json.dumps(status(args.path), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import gspread
+import streamlit as st
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from google.oauth2.service_account import Credentials
+
+# =========================
+# Google Sheets 공용 클라이언트 (프로세스당 1개)
+# - app.py 는 rerun마다 다시 실행되지만, import된 모듈은 프로세스 수명 동안 유지됨
+# - 인증/스프레드시트/워크시트 핸들을 한 번만 만들고 모든 세션 스레드가 공유
+# =========================
+SPREADSHEET_KEY = "12l-MzIhszbWb5kV3muWyGoqyfBaKD4CARjqKktndiAg"
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+TIMING_HISTORY = 200  # 단계별 최근 기록 보관 개수
+RECONNECT_STATUS = (401, 403, 404)  # 인증/권한/시트 없음 → 핸들을 다시 만들어야 하는 응답
+
+
+def needs_reconnect(exc: Exception) -> bool:
+    # 429(할당량)·5xx·네트워크 오류는 핸들이 멀쩡함 → 그대로 재시도해야 재인증/open 호출로 할당량을 더 쓰지 않음
+    if isinstance(exc, (RefreshError, gspread.exceptions.SpreadsheetNotFound,
+                        gspread.exceptions.WorksheetNotFound)):
+        return True
+    if isinstance(exc, gspread.exceptions.APIError):
+        code = exc.code if exc.code > 0 else getattr(exc.response, "status_code", None)
+        return code in RECONNECT_STATUS
+    return False
+
+
+def _service_account_info():
+    return st.secrets["gcp_service_account"]
+
+
+class SheetsPool:
+    def __init__(self, spreadsheet_key: str, scopes=SCOPES):
+        self.spreadsheet_key = spreadsheet_key
+        self.scopes = scopes
+        self._lock = threading.RLock()
+        self._creds = None
+        self._client = None
+        self._spreadsheet = None
+        self._worksheets = {}
+        self._timings = defaultdict(lambda: deque(maxlen=TIMING_HISTORY))
+
+    @contextmanager
+    def timed(self, stage: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timings[stage].append(time.perf_counter() - t0)
+
+    def _ensure_client(self):
+        # 호출 측에서 self._lock 을 잡은 상태여야 함
+        if self._client is None:
+            with self.timed("auth"):
+                self._creds = Credentials.from_service_account_info(
+                    _service_account_info(), scopes=self.scopes
+                )
+                self._client = gspread.authorize(self._creds)
+        if not self._creds.valid:
+            # 만료 직전 토큰은 한 스레드만 갱신 (동시 갱신 방지)
+            with self.timed("refresh"):
+                self._creds.refresh(Request())
+
+    def worksheet(self, name: str):
+        with self._lock:
+            self._ensure_client()
+            ws = self._worksheets.get(name)
+            if ws is None:
+                if self._spreadsheet is None:
+                    with self.timed("open"):
+                        self._spreadsheet = self._client.open_by_key(self.spreadsheet_key)
+                with self.timed("worksheet"):
+                    ws = self._spreadsheet.worksheet(name)
+                self._worksheets[name] = ws
+            return ws
+
+    def invalidate(self):
+        # 시트 삭제/이름 변경, 권한 변경 등 이후 핸들을 다시 만들도록 초기화
+        with self._lock:
+            self._creds = None
+            self._client = None
+            self._spreadsheet = None
+            self._worksheets = {}
+
+    def append_row(self, name: str, values: list):
+        ws = self.worksheet(name)
+        try:
+            with self.timed("append"):
+                ws.append_row(values)
+        except Exception as e:
+            if needs_reconnect(e):
+                self.invalidate()
+            raise
+
+    def append_rows(self, name: str, rows: list):
+        ws = self.worksheet(name)
+        try:
+            with self.timed("append"):
+                ws.append_rows(rows)
+        except Exception as e:
+            if needs_reconnect(e):
+                self.invalidate()
+            raise
+
+    def timings(self) -> dict:
+        out = {}
+        for stage, samples in list(self._timings.items()):
+            samples = list(samples)
+            if not samples:
+                continue
+            out[stage] = {
+                "count": len(samples),
+                "last": samples[-1],
+                "mean": sum(samples) / len(samples),
+                "max": max(samples),
+            }
+        return out
+
+
+_pool = SheetsPool(SPREADSHEET_KEY)
+
+
+def get_pool() -> SheetsPool:
+    return _pool
+
+
+def append_row(name: str, values: list):
+    _pool.append_row(name, values)
+
+
+def append_rows(name: str, rows: list):
+    _pool.append_rows(name, rows)
@@ -0,0 +1,63 @@
+import pytest
+
+import analytics
+import outbox
+
+
+def _row(i, total):
+    return [f"2026-01-01 00:00:{i:02d}", total, 20, 20, 20, 5, 1 + i % 2, 11] + [3] * 27 + [1, 2, 1, 2, 1, 0, 0, 1, 2]
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "outbox.sqlite3")
+
+
+def _send_all(db):
+    rows = outbox.claim_due(100, db)
+    outbox.mark_sent([r[0] for r in rows], db)
+    return rows
+
+
+def test_aggregates_count_only_sent_rows(db):
+    outbox.enqueue("s1", [("sheet1", _row(1, 60)), ("feedback", ["t", "의견"])], db)
+    outbox.enqueue("s2", [("sheet1", _row(2, 80))], db)
+    assert analytics.snapshot(db)["n"] == 0  # 아직 시트 전송 전
+
+    rows = outbox.claim_due(1, db)
+    outbox.mark_failed(rows, "429", db)
+    assert analytics.snapshot(db)["n"] == 0  # 실패 → 집계하지 않음
+
+    outbox._cmd_retry(type("Args", (), {"path": db})())
+    _send_all(db)
+    snap = analytics.snapshot(db)
+    assert snap["n"] == 2
+    assert snap["scores"]["total"]["mean"] == 70
+    assert {g["code"]: g["n"] for g in snap["dims"]["전체유형코드"]} == {1: 1, 2: 1}
+
+
+def test_mark_sent_twice_counts_once(db):
+    outbox.enqueue("s1", [("sheet1", _row(1, 60))], db)
+    rows = _send_all(db)
+    outbox.mark_sent([r[0] for r in rows], db)  # lease 만료 후 다른 워커가 같은 행을 다시 보낸 경우
+    assert analytics.snapshot(db)["n"] == 1
+
+
+def test_rebuild_matches_running_aggregates(db):
+    for i in range(5):
+        outbox.enqueue(f"s{i}", [("sheet1", _row(i, 50 + i * 7))], db)
+    outbox.mark_sent([r[0] for r in outbox.claim_due(3, db)], db)
+    before = analytics.snapshot(db)
+    with outbox.connect(db) as conn:
+        analytics.rebuild(conn)
+    assert analytics.snapshot(db) == before
+    assert before["n"] == 3
+
+
+def test_is_admin(monkeypatch):
+    monkeypatch.setattr(analytics, "ADMIN_TOKEN", "s3cret")
+    assert analytics.is_admin({"admin": "s3cret"})
+    assert not analytics.is_admin({"admin": "s3cre"})
+    assert not analytics.is_admin({})
+    monkeypatch.setattr(analytics, "ADMIN_TOKEN", "")
+    assert not analytics.is_admin({"admin": ""})
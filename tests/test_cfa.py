@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import cfa
+
+
+def _true_x():
+    rng = np.random.default_rng(1)
+    lam = rng.uniform(0.4, 0.8, size=cfa.P)
+    corr = np.arctanh([0.5, 0.3, 0.4])
+    theta = np.log(rng.uniform(0.3, 0.6, size=cfa.P))
+    return np.concatenate([lam, corr, theta])
+
+
+def _simulate(x, n, seed):
+    # 모형 Σ 에서 정규 표본 → 문항 순서(q1~q27)로 배치
+    rng = np.random.default_rng(seed)
+    z = rng.multivariate_normal(np.zeros(cfa.P), cfa.implied_cov(x), size=n)
+    out = np.empty_like(z)
+    out[:, cfa.ITEMS] = z
+    return out
+
+
+@pytest.fixture(scope="module")
+def likert():
+    # 부트스트랩용 1~4 정수 응답 (연속 표본을 4구간으로 자름)
+    z = _simulate(_true_x(), 400, seed=2)
+    return np.digitize(z, [-0.8, 0.0, 0.8]).astype(np.int8) + 1
+
+
+def test_gradient_matches_finite_difference():
+    s = cfa.sample_cov(_simulate(_true_x(), 500, seed=3))
+    _, logdet_s = np.linalg.slogdet(s)
+    x = cfa.start_values(s)
+    f, grad = cfa._objective(x, s, logdet_s)
+    eps = 1e-6
+    numeric = np.empty_like(x)
+    for j in range(len(x)):
+        step = np.zeros_like(x)
+        step[j] = eps
+        numeric[j] = (cfa._objective(x + step, s, logdet_s)[0] - cfa._objective(x - step, s, logdet_s)[0]) / (2 * eps)
+    np.testing.assert_allclose(grad, numeric, rtol=1e-4, atol=1e-7)
+
+
+def test_recovers_parameters_from_simulated_data():
+    x = _true_x()
+    r = cfa.fit(_simulate(x, 20_000, seed=4))
+    lam, phi, theta = cfa._unpack(x)
+    assert r["converged"]
+    np.testing.assert_allclose(r["loadings"], lam[np.arange(cfa.P), cfa.ITEM_FACTOR], atol=0.05)
+    np.testing.assert_allclose(list(r["factor_corr"].values()), [phi[a, b] for a, b in cfa.PHI_PAIRS], atol=0.05)
+    np.testing.assert_allclose(r["uniqueness"], theta, atol=0.05)
+    assert r["cfi"] > 0.99 and r["rmsea"] < 0.02 and r["srmr"] < 0.02  # 모형이 맞으면 적합도 양호
+
+
+def test_fit_rejects_singular_covariance():
+    a = np.full((50, 27), 3)
+    with pytest.raises(ValueError):
+        cfa.fit(a)
+
+
+def test_bootstrap_independent_of_workers_and_chunks(likert):
+    x0 = cfa.fit(likert)["_x"]
+    one = cfa.bootstrap(likert, n_boot=12, seed=7, workers=1, x0=x0, chunk=12)
+    two = cfa.bootstrap(likert, n_boot=12, seed=7, workers=2, x0=x0, chunk=5)
+    other = cfa.bootstrap(likert, n_boot=12, seed=8, workers=1, x0=x0, chunk=12)
+    assert one["ok"] == 12
+    assert one["ci"] == two["ci"]  # 재표집마다 자식 시드 → 프로세스 수/묶음 크기와 무관
+    assert one["ci"] != other["ci"]
+    assert set(one["ci"]) == set(cfa._stat_names())
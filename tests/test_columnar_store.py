@@ -0,0 +1,72 @@
+import os
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import columnar_store
+
+
+def _record(i):
+    ts = datetime(2026, 3, 2, 9, 0) + timedelta(seconds=i)
+    return {"timestamp": ts.isoformat(), "gender": "남", "age": 30 + i % 20, "bo_1": 1 + i % 5}
+
+
+def _files(root, prefix=""):
+    directory = os.path.join(root, "date=2026-03-02")
+    return sorted(f for f in os.listdir(directory) if f.startswith(prefix) and f.endswith(".parquet"))
+
+
+def _ages(root):
+    return sorted(columnar_store.load(columns=["age"], root=root).column("age").to_pylist())
+
+
+def test_auto_compaction_merges_only_new_parts(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar_store, "COMPACT_FILES", 4)
+    root = str(tmp_path)
+    for i in range(4):
+        columnar_store.append_record(_record(i), root)
+    first = _files(root, "compacted-")
+    assert len(first) == 1 and _files(root, "part-") == []
+
+    for i in range(4, 8):
+        columnar_store.append_record(_record(i), root)
+    # 두 번째 병합은 새 part 만 합침 → 첫 병합 파일은 그대로
+    assert first[0] in _files(root, "compacted-")
+    assert len(_files(root, "compacted-")) == 2
+    assert _ages(root) == sorted(30 + i % 20 for i in range(8))
+
+
+def test_compacted_files_are_merged_at_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar_store, "COMPACT_FILES", 3)
+    root = str(tmp_path)
+    for i in range(9):
+        columnar_store.append_record(_record(i), root)
+    assert len(_files(root)) < 3
+    assert _ages(root) == sorted(30 + i % 20 for i in range(9))
+
+
+def test_interrupted_compaction_hides_covered_parts(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar_store, "COMPACT_FILES", 0)  # 자동 병합 끔
+    root = str(tmp_path)
+    for i in range(5):
+        columnar_store.append_record(_record(i), root)
+    directory = os.path.join(root, "date=2026-03-02")
+    parts = [os.path.join(directory, f) for f in _files(root, "part-")]
+    # 병합 파일만 쓰고 원본을 지우기 전에 중단된 상태
+    table = pa.concat_tables(pq.read_table(p, schema=columnar_store.SCHEMA) for p in parts[:3])
+    columnar_store._write_atomic(table, directory, "compacted", [os.path.basename(p) for p in parts[:3]])
+    assert len(_files(root)) == 6
+    assert _ages(root) == sorted(30 + i for i in range(5))  # 중복 없음
+
+    columnar_store.compact(root)  # 남은 원본 정리 + 새 part 병합
+    assert len(_files(root)) == 2
+    assert _ages(root) == sorted(30 + i for i in range(5))
+
+    columnar_store.compact(root, full=True)
+    assert len(_files(root)) == 1
+    assert _ages(root) == sorted(30 + i for i in range(5))
+
+
+def test_load_empty_store(tmp_path):
+    assert columnar_store.load(root=str(tmp_path)).num_rows == 0
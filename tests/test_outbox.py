@@ -0,0 +1,94 @@
+import json
+import time
+from contextlib import closing
+
+import pytest
+
+import outbox
+
+
+def _row(i):
+    return [f"2026-01-01 00:00:{i:02d}", 60, 20, 20, 20, 5, 1, 11] + [3] * 27 + [1, 2, 1, 2, 1, 0, 0, 1, 2]
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "outbox.sqlite3")
+
+
+def _retry(db):
+    outbox._cmd_retry(type("Args", (), {"path": db})())
+
+
+def _columns(db, row_id, *names):
+    with closing(outbox.connect(db)) as conn:
+        return conn.execute(f"SELECT {', '.join(names)} FROM outbox WHERE id = ?", (row_id,)).fetchone()
+
+
+def test_claim_due_leases_rows(db):
+    outbox.enqueue("s1", [("sheet1", _row(1)), ("phone", ["t", "010-0000-0000"])], db)
+    first = outbox.claim_due(10, db)
+    assert [r[1] for r in first] == ["sheet1", "phone"]
+    assert outbox.claim_due(10, db) == []  # lease 중 → 다른 워커가 다시 가져가지 않음
+    assert 0 < outbox.next_due_in(db) <= outbox.CLAIM_LEASE
+
+
+def test_expired_lease_is_claimed_again(db, monkeypatch):
+    outbox.enqueue("s1", [("sheet1", _row(1))], db)
+    outbox.claim_due(10, db)
+    now = time.time()
+    monkeypatch.setattr(outbox.time, "time", lambda: now + outbox.CLAIM_LEASE + 1)
+    assert len(outbox.claim_due(10, db)) == 1
+
+
+def test_mark_failed_backs_off(db, monkeypatch):
+    monkeypatch.setattr(outbox.random, "uniform", lambda a, b: b)
+    outbox.enqueue("s1", [("sheet1", _row(1))], db)
+    for attempts in range(1, 4):
+        rows = outbox.claim_due(10, db)
+        outbox.mark_failed(rows, "429 quota", db)
+        _, next_at, error, leased = _columns(db, rows[0][0], "attempts", "next_attempt_at", "last_error", "leased_until")
+        assert leased is None
+        assert error == "429 quota"
+        assert next_at - time.time() == pytest.approx(outbox.BACKOFF_BASE * 2 ** (attempts - 1), abs=1)
+        assert outbox.claim_due(10, db) == []  # 백오프 동안은 가져가지 않음
+        assert outbox.status("s1", db)["sheet1"] == (outbox.RETRYING, "429 quota")
+        _retry(db)
+    assert outbox.backoff_delay(100) <= outbox.BACKOFF_MAX
+
+
+def test_retry_skips_leased_rows(db):
+    outbox.enqueue("s1", [("sheet1", _row(1))], db)
+    outbox.enqueue("s2", [("sheet1", _row(2))], db)
+    failed, leased = outbox.claim_due(10, db)
+    outbox.mark_failed([failed], "500", db)
+    _retry(db)
+    # 실패한 행만 즉시 재시도 대상, 전송 중인(lease) 행은 그대로
+    assert [r[0] for r in outbox.claim_due(10, db)] == [failed[0]]
+    assert _columns(db, leased[0], "leased_until")[0] > time.time()
+
+
+def test_replay_sends_and_redacts(db, monkeypatch):
+    sent = []
+    monkeypatch.setattr(outbox.sheets, "append_rows", lambda ws, rows: sent.append((ws, rows)))
+    outbox.enqueue("s1", [("sheet1", _row(1)), ("phone", ["t", "010-0000-0000"]), ("feedback", ["t", "의견"])], db)
+    assert outbox.replay_once(path=db) == 3
+    assert [ws for ws, _ in sent] == ["sheet1", "phone", "feedback"]
+    assert outbox.status("s1", db) == {ws: (outbox.SAVED, "") for ws in ("sheet1", "phone", "feedback")}
+    with closing(outbox.connect(db)) as conn:
+        payloads = dict(conn.execute("SELECT worksheet, payload FROM outbox"))
+    assert json.loads(payloads["phone"]) == ["t"]  # 전송 후 연락처/의견 내용은 지움
+    assert json.loads(payloads["feedback"]) == ["t"]
+    assert json.loads(payloads["sheet1"]) == _row(1)
+    assert outbox.next_due_in(db) is None
+
+
+def test_replay_failure_keeps_rows(db, monkeypatch):
+    def fail(ws, rows):
+        raise RuntimeError("APIError 503")
+
+    monkeypatch.setattr(outbox.sheets, "append_rows", fail)
+    outbox.enqueue("s1", [("sheet1", _row(1))], db)
+    assert outbox.replay_once(path=db) == 0
+    assert outbox.status("s1", db)["sheet1"] == (outbox.RETRYING, "APIError 503")
+    assert outbox.stats(db)["sheet1"]["retrying"] == 1
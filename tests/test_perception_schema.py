@@ -0,0 +1,43 @@
+import numpy as np
+
+import perception_schema as ps
+from perception_schema import AnswerRecord
+
+
+def test_answer_record_round_trip():
+    record = AnswerRecord()
+    values = {c: 1 + k % 7 for k, c in enumerate(ps.ITEM_COLUMNS)}
+    values.update({
+        "gender": 1, "want_reward": ps.REWARD_YES, "age": 45, "years": 12,
+        "edu_experience": [0, 2], "org": "○○교도소", "phone_number": "010-0000-0000",
+    })
+    record.update(values)
+
+    assert record.codes.dtype == np.int8 and record.codes.shape == (ps.N_SLOTS,)
+    for col, v in values.items():
+        assert record.get(col) == v
+    assert record.label("gender") == ps.GENDER_OPTIONS[1]
+    assert record.label("want_reward") == "예"
+    assert record.edu_labels() == [ps.EDU_EXPERIENCE_OPTIONS[0], ps.EDU_EXPERIENCE_OPTIONS[2]]
+    assert record.item_values() == {c: values[c] for c in ps.ITEM_COLUMNS}
+
+
+def test_answer_record_missing_and_overwrite():
+    record = AnswerRecord()
+    assert record.get("BO_01") is None and record.get("BO_01", 0) == 0
+    assert record.label("gender") is None and record.edu_labels() == []
+    assert set(record.item_values().values()) == {None}
+
+    record.update({"BO_01": 4, "gender": 0})
+    record.update({"BO_01": None, "gender": 2})  # 이전 섹션으로 돌아가 응답을 지우거나 바꾼 경우
+    assert record.get("BO_01") is None
+    assert record.label("gender") == ps.GENDER_OPTIONS[2]
+
+
+def test_codes_match_label_converters():
+    # 정수 코드 = 이전 방식(표시 문자열 파싱) 값
+    for labels, to_num in [(ps.LIKERT5, ps.likert5_to_num), (ps.SDIFF_7, ps.sdiff7_to_num),
+                           (ps.FREQ3, ps.freq3_to_num), (ps.YESNO3, ps.yesno3_to_num)]:
+        for code in ps.scale_codes(labels):
+            assert to_num(ps.scale_label(labels, code)) == code
+        assert to_num(None) is None and to_num("") is None
@@ -0,0 +1,22 @@
+import numpy as np
+
+import outbox
+import reliability
+
+
+def _row(i):
+    answers = [1 + (i + k) % 4 for k in range(27)]
+    return [f"2026-01-01 00:00:{i:02d}", sum(answers), 20, 20, 20, 5, 1, 11] + answers + [1, 2, 1, 2, 1, 0, 0, 1, 2]
+
+
+def test_running_state_follows_sent_rows(tmp_path):
+    db = str(tmp_path / "outbox.sqlite3")
+    for i in range(6):
+        outbox.enqueue(f"s{i}", [("sheet1", _row(i))], db)
+    assert reliability.current(db).n == 0
+
+    outbox.mark_sent([r[0] for r in outbox.claim_due(4, db)], db)
+    rc = reliability.current(db)
+    assert rc.n == 4
+    expected = np.array([_row(i)[8:35] for i in range(4)], dtype=float)
+    np.testing.assert_allclose(rc.cov(), np.cov(expected, rowvar=False))
@@ -0,0 +1,83 @@
+import statistics
+import time
+
+import pytest
+from reportlab import rl_config
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFontFace
+
+import result_pdf
+import scoring
+
+
+@pytest.fixture
+def result():
+    r = scoring.score_one([3, 2, 4, 1] * 6 + [3, 3, 3])
+    r["time_str"] = "2026-10-18 10:00:00"
+    return r
+
+
+@pytest.fixture
+def uncached(monkeypatch):
+    # 변경 전 경로: reportlab 기본 subset 생성 + 고정 층을 매번 그림 + ASCII85
+    result_pdf.init_fonts()
+    face = pdfmetrics.getFont(result_pdf.FONT_NAME).face
+    monkeypatch.setattr(face, "__class__", TTFontFace)
+
+    def make(r):
+        monkeypatch.setattr(result_pdf, "_static_ops", None)
+        return result_pdf.make_result_pdf(r, ascii85=True)
+
+    return make
+
+
+def _median_ms(fn, n=9):
+    times = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000, len(out)
+
+
+def test_size_and_time_before_after(result, uncached, monkeypatch):
+    before_ms, before_size = _median_ms(lambda: uncached(result))
+    monkeypatch.undo()
+    result_pdf.make_result_pdf(result)  # 캐시 채움
+    after_ms, after_size = _median_ms(lambda: result_pdf.make_result_pdf(result))
+    print(f"before {before_ms:.1f} ms {before_size} B / after {after_ms:.1f} ms {after_size} B")
+    assert after_size < before_size
+    assert after_ms < before_ms
+
+
+def test_cached_output_matches_uncached(result, uncached, monkeypatch):
+    pymupdf = pytest.importorskip("pymupdf")
+    before = uncached(result)
+    monkeypatch.undo()
+    result_pdf.make_result_pdf(result)
+    after = result_pdf.make_result_pdf(result)
+
+    def text(data):
+        with pymupdf.open(stream=data, filetype="pdf") as doc:
+            return [page.get_text() for page in doc]
+
+    assert text(after) == text(before)
+    assert "나의 감·수·성 인권감수성 결과" in text(after)[0]
+
+
+def test_ascii85_setting_is_per_canvas(result):
+    assert rl_config.useA85 == 1
+    data = result_pdf.make_result_pdf(result)
+    assert b"/ASCII85Decode" not in data
+    assert b"/ASCII85Decode" in result_pdf.make_result_pdf(result, ascii85=True)
+    assert rl_config.useA85 == 1  # 전역 기본값은 그대로
+
+
+def test_radar_max_value_scales_axis():
+    # 정신질환 상황 요인(3~12점)은 12점 축에서 끝까지 닿아야 함
+    assert result_pdf._radar_rings(result_pdf.RADAR_MAX) == result_pdf.RADAR_RINGS
+    assert result_pdf._radar_rings(result_pdf.RADAR_MAX_MH) == [3, 6, 9, 12]
+    (x, y), *_ = result_pdf._radar_points(0, 0, 100, [12, 12, 12], result_pdf.RADAR_MAX_MH)
+    assert (round(x), round(y)) == (100, 0)
+    (x, y), *_ = result_pdf._radar_points(0, 0, 100, [12, 12, 12])
+    assert (round(x), round(y)) == (33, 0)
@@ -0,0 +1,66 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import scoring
+
+
+def _scalar(answers):
+    # 배치 엔진 이전의 건별 채점 (문항 합 + classify_* 규칙)
+    gam, su, seong = sum(answers[0:9]), sum(answers[9:18]), sum(answers[18:27])
+    mh = [answers[i - 1] for i in scoring.MH_ITEMS]
+    mh_gam, mh_su, mh_seong = sum(answers[6:9]), sum(answers[15:18]), sum(answers[24:27])
+    total = gam + su + seong
+    return {
+        "total": total, "감": gam, "수": su, "성": seong, "정신": sum(mh),
+        "mh_gam": mh_gam, "mh_su": mh_su, "mh_seong": mh_seong,
+        "main_type_key": scoring.classify_main_type(total, gam, su, seong),
+        "mh_type_key": scoring.classify_mental_type(sum(mh), mh_gam, mh_su, mh_seong),
+    }
+
+
+def _answers():
+    rng = np.random.default_rng(20240601)
+    uniform = rng.integers(1, 5, size=(3_000, scoring.N_ITEMS))
+    # 응답자마다 치우침을 줘서 균형형/우수형/보통형과 경계(총점 67·68, 정신 19·20)가 고루 나오게
+    bias = rng.integers(1, 5, size=(3_000, 1))
+    skewed = np.clip(bias + rng.integers(-1, 2, size=(3_000, scoring.N_ITEMS)), 1, 4)
+    fixed = np.array([[v] * scoring.N_ITEMS for v in range(1, 5)])
+    return np.vstack([uniform, skewed, fixed])
+
+
+def test_score_batch_matches_scalar():
+    a = _answers()
+    b = scoring.score_batch(a)
+    for n, row in enumerate(a.tolist()):
+        expected = _scalar(row)
+        for k in scoring.SCORE_KEYS:
+            assert int(b[k][n]) == expected[k], (n, k)
+        assert scoring.TYPE_KEYS[b["main_type_idx"][n]] == expected["main_type_key"], n
+        assert scoring.TYPE_KEYS[b["mh_type_idx"][n]] == expected["mh_type_key"], n
+    assert set(b["main_type_idx"].tolist()) == set(range(len(scoring.TYPE_KEYS)))
+    assert set(b["mh_type_idx"].tolist()) == set(range(len(scoring.TYPE_KEYS)))
+
+
+@pytest.mark.parametrize("lo, hi, mid_cut, gap", [(9, 36, 19, 3), (3, 12, 7, 2)])
+def test_classify_batch_matches_scalar_rule(lo, hi, mid_cut, gap):
+    # 세 축 점수의 모든 조합에서 벡터 규칙 == classify_4type_by_scores (동점 우선순위 포함)
+    axes = np.array(list(itertools.product(range(lo, hi + 1), repeat=3)), dtype=np.int16)
+    idx = scoring._classify_batch(np.zeros(len(axes), dtype=bool), axes, mid_cut, gap)
+    for (g, s, r), k in zip(axes.tolist(), idx.tolist()):
+        assert scoring.TYPE_KEYS[k] == scoring.classify_4type_by_scores(g, s, r, mid_cut, gap)
+
+
+def test_score_one_matches_batch():
+    answers = [3, 2, 4, 1] * 6 + [3, 3, 3]
+    r = scoring.score_one(answers)
+    expected = _scalar(answers)
+    assert {k: r[k] for k in expected} == expected
+    assert r["main_type_code"] == scoring.TYPE_CODE_MAIN[r["main_type_key"]]
+    assert r["mh_type_code"] == scoring.TYPE_CODE_MH[r["mh_type_key"]]
+
+
+def test_score_batch_rejects_wrong_width():
+    with pytest.raises(ValueError):
+        scoring.score_batch([[3] * (scoring.N_ITEMS - 1)])
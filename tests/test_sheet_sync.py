@@ -0,0 +1,94 @@
+import sqlite3
+
+from gspread.utils import a1_to_rowcol
+
+import responses
+import sheet_sync
+
+
+class FakeWorksheet:
+    # gspread Worksheet.get(a1, value_render_option=...) 흉내 (뒤쪽 빈 행은 잘라서 반환)
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get(self, a1, value_render_option=None):
+        start, end = a1.split(":")
+        r1, _ = a1_to_rowcol(start)
+        r2, c2 = a1_to_rowcol(end)
+        out = [r[:c2] for r in self.rows[r1 - 1:r2]]
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+
+def _row(i):
+    return [f"2026-01-01 00:00:{i:02d}", 60 + i, 20, 20, 20, 5, 1, 11] + [1 + i % 4] * 27 + [1, 2, 1, 2, 1, 0, 0, 1, 2]
+
+
+def _times(path):
+    return [r["time"] for r in sheet_sync.read_rows("sheet1", path)]
+
+
+def test_incremental_sync(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    rows = [responses.SHEET1_COLUMNS] + [_row(i) for i in range(10)]
+    ws = FakeWorksheet(rows)
+    conn = sheet_sync.connect(path)
+    assert sheet_sync.sync_worksheet(conn, "sheet1", ws, chunk=3) == 10
+    assert sheet_sync.sync_worksheet(conn, "sheet1", ws, chunk=3) == 0
+    rows += [_row(10), _row(11)]
+    assert sheet_sync.sync_worksheet(conn, "sheet1", ws, chunk=3) == 2
+    assert _times(path) == [_row(i)[0] for i in range(12)]
+    assert sheet_sync.read_rows("sheet1", path)[0]["total"] == 60
+
+
+def test_deleted_rows_do_not_break_sync(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    rows = [responses.SHEET1_COLUMNS] + [_row(i) for i in range(10)]
+    ws = FakeWorksheet(rows)
+    conn = sheet_sync.connect(path)
+    sheet_sync.sync_worksheet(conn, "sheet1", ws, chunk=4)
+    del rows[2:5]  # 위쪽 행 삭제 → 마지막으로 받은 행이 3줄 올라감
+    rows.append(_row(10))
+    assert sheet_sync.sync_worksheet(conn, "sheet1", ws, chunk=4) == 1
+    assert sheet_sync.cursor(conn, "sheet1")[0] == len(rows)  # 헤더 포함 시트 행 번호
+    assert _times(path) == [_row(i)[0] for i in range(11)]
+
+
+def test_changed_last_row_rescans_without_duplicates(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    rows = [responses.SHEET1_COLUMNS] + [_row(i) for i in range(5)]
+    ws = FakeWorksheet(rows)
+    conn = sheet_sync.connect(path)
+    sheet_sync.sync_worksheet(conn, "sheet1", ws)
+    rows[5] = _row(7)  # 마지막 행 수정 → 처음부터 다시 훑어도 나머지 행은 키로 건너뜀
+    assert sheet_sync.sync_worksheet(conn, "sheet1", ws) == 1
+    assert len(_times(path)) == 6
+
+
+def test_non_numeric_cell_becomes_none(tmp_path, capsys):
+    path = str(tmp_path / "cache.sqlite3")
+    bad = _row(0)
+    bad[1] = "abc"
+    ws = FakeWorksheet([responses.SHEET1_COLUMNS, bad, _row(1)])
+    conn = sheet_sync.connect(path)
+    assert sheet_sync.sync_worksheet(conn, "sheet1", ws) == 2
+    first = sheet_sync.read_rows("sheet1", path)[0]
+    assert first["total"] is None and first["q1"] == 1
+    assert "total" in capsys.readouterr().err
+    assert responses.from_values(["2024", "abc", "3"])["total"] is None
+
+
+def test_old_cache_with_phone_is_dropped(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    old = sqlite3.connect(path)
+    old.execute("CREATE TABLE ws_phone (sheet_row INTEGER PRIMARY KEY, time TEXT, phone TEXT)")
+    old.execute("INSERT INTO ws_phone VALUES (1, 't', '01012345678')")
+    old.commit()
+    old.close()
+    conn = sheet_sync.connect(path)
+    tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "ws_phone" not in tables and "phone" not in sheet_sync.WORKSHEETS
+    conn.close()
+    with open(path, "rb") as f:
+        assert b"01012345678" not in f.read()
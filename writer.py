@@ -0,0 +1,72 @@
+import threading
+import uuid
+
+import outbox
+
+# =========================
+# 제출 응답 비동기 저장(write-behind)
+# - 제출은 먼저 로컬 outbox(SQLite)에 커밋하고 바로 반환
+# - 별도 스레드가 outbox 를 워크시트별로 모아서 append_rows 로 전송(실패 시 백오프 재시도)
+# - 제출별 상태는 submission_id 로 조회 (결과 화면에서 주기적으로 확인)
+# =========================
+BATCH_MAX = 200         # 한 번에 전송할 최대 행 수
+IDLE_WAIT = 30.0        # 대기 행이 없을 때 다시 확인하는 간격(초)
+
+PENDING = outbox.PENDING
+RETRYING = outbox.RETRYING
+SAVED = outbox.SAVED
+
+
+class SheetWriter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="sheet-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, items: list) -> str:
+        # items: [(worksheet 이름, 행 값 리스트), ...]
+        sid = uuid.uuid4().hex
+        outbox.enqueue(sid, items)  # 디스크 커밋 후 반환 → 이후 전송 실패에도 응답 보존
+        self._ensure_thread()
+        self._wakeup.set()
+        return sid
+
+    def status(self, sid: str) -> dict:
+        return outbox.status(sid)
+
+    def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                sent = outbox.replay_once(limit=BATCH_MAX)
+                wait = outbox.next_due_in()
+            except Exception:
+                # outbox 접근 자체가 실패한 경우(디스크 잠금 등) 잠시 후 재시도
+                sent, wait = 0, outbox.BACKOFF_BASE
+            if sent and wait == 0:
+                continue
+            self._wakeup.wait(IDLE_WAIT if wait is None else min(wait, IDLE_WAIT))
+
+
+_writer = SheetWriter()
+
+
+def start():
+    # 서버 재시작 후 남아 있는 outbox 행을 제출 없이도 다시 전송하도록
+    _writer._ensure_thread()
+
+
+def submit(items: list) -> str:
+    return _writer.submit(items)
+
+
+def status(sid: str) -> dict:
+    return _writer.status(sid)